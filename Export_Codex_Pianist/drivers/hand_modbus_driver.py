@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import logging
+import struct
 import time
 from dataclasses import dataclass
-from typing import Iterable, Optional, Sequence
+from typing import Iterable, Mapping, Optional, Sequence
 
 try:
     import minimalmodbus
@@ -12,9 +13,37 @@ except Exception as exc:  # pragma: no cover - import availability depends on en
     minimalmodbus = None
     _MINIMALMODBUS_IMPORT_ERROR = exc
 
+try:
+    from serial.rs485 import RS485Settings
+except Exception:  # pragma: no cover - import availability depends on environment
+    RS485Settings = None
+
 
 LOGGER = logging.getLogger(__name__)
 
+MODBUS_WRITE_MULTIPLE_REGISTERS = 0x10
+
+
+def _build_crc16_modbus_table() -> tuple[int, ...]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC16_MODBUS_TABLE = _build_crc16_modbus_table()
+
+
+def _crc16_modbus(data: bytes) -> bytes:
+    """CRC-16/MODBUS of data in wire (little-endian) byte order."""
+    crc = 0xFFFF
+    for byte in data:
+        crc = (crc >> 8) ^ _CRC16_MODBUS_TABLE[(crc ^ byte) & 0xFF]
+    return crc.to_bytes(2, "little")
+
 
 @dataclass
 class InspireHandConfig:
@@ -22,6 +51,8 @@ class InspireHandConfig:
     slave_id: int = 1
     baudrate: int = 115200
     timeout_seconds: float = 0.2
+    low_latency: bool = False
+    rs485_mode: bool = False
 
 
 class InspireHandDriver:
@@ -33,16 +64,26 @@ class InspireHandDriver:
     ANGLE_SET_BASE_ADDR = 1486
     MOTOR_COUNT = 6
     NO_ACTION_VALUE = 0xFFFF  # signed -1 in uint16 representation
+    _NO_ACTION_COMMAND = (NO_ACTION_VALUE,) * MOTOR_COUNT
+    # set_motor_targets can stream arbitrary targets; keep only the most recent frames.
+    _FRAME_CACHE_SIZE = 64
 
     def __init__(self, config: InspireHandConfig) -> None:
         self.config = config
         self.instrument: Optional[minimalmodbus.Instrument] = None
+        # Angle register address that last accepted a write, and RTU frames prebuilt for it.
+        self._frame_address: Optional[int] = None
+        self._frame_cache: dict[tuple[int, ...], tuple[bytes, bytes]] = {}
+        # Base address -> register address that accepted the last write, tried first next time.
+        self._resolved_addr: dict[int, int] = {}
 
     def connect(self) -> bool:
         if minimalmodbus is None:
             LOGGER.error("minimalmodbus is unavailable: %s", _MINIMALMODBUS_IMPORT_ERROR)
             return False
 
+        self._forget_frames()
+        self._resolved_addr.clear()
         try:
             instrument = minimalmodbus.Instrument(self.config.port, self.config.slave_id)
             instrument.serial.baudrate = self.config.baudrate
@@ -51,6 +92,10 @@ class InspireHandDriver:
             instrument.serial.parity = "N"
             instrument.serial.stopbits = 1
             instrument.mode = minimalmodbus.MODE_RTU
+            if self.config.low_latency:
+                self._enable_low_latency(instrument.serial)
+            if self.config.rs485_mode:
+                self._enable_rs485_mode(instrument.serial)
             self.instrument = instrument
             LOGGER.info(
                 "Initialized Inspire hand Modbus on %s (slave %s)",
@@ -63,6 +108,30 @@ class InspireHandDriver:
             self.instrument = None
             return False
 
+    @staticmethod
+    def _enable_low_latency(serial_port: object) -> None:
+        # pyserial sets ASYNC_LOW_LATENCY via TIOCGSERIAL/TIOCSSERIAL on Linux only.
+        if not hasattr(serial_port, "set_low_latency_mode"):
+            LOGGER.warning("Serial backend has no low-latency mode; continuing without it.")
+            return
+        try:
+            serial_port.set_low_latency_mode(True)
+            LOGGER.info("Enabled ASYNC_LOW_LATENCY on %s", serial_port.port)
+        except Exception as exc:
+            LOGGER.warning("set_low_latency_mode failed (continuing): %s", exc)
+
+    @staticmethod
+    def _enable_rs485_mode(serial_port: object) -> None:
+        # Kernel-driven DE/RE via TIOCSRS485; auto-direction adapters reject it and need no help.
+        if RS485Settings is None or not hasattr(serial_port, "rs485_mode"):
+            LOGGER.warning("Serial backend has no RS485 mode; continuing without it.")
+            return
+        try:
+            serial_port.rs485_mode = RS485Settings(rts_level_for_tx=True, rts_level_for_rx=False)
+            LOGGER.info("Enabled kernel RS485 direction control on %s", serial_port.port)
+        except Exception as exc:
+            LOGGER.warning("RS485 mode failed (continuing): %s", exc)
+
     def disconnect(self) -> None:
         if self.instrument is None:
             return
@@ -74,6 +143,12 @@ class InspireHandDriver:
             LOGGER.warning("Inspire hand disconnect raised: %s", exc)
         finally:
             self.instrument = None
+            self._forget_frames()
+            self._resolved_addr.clear()
+
+    def _forget_frames(self) -> None:
+        self._frame_address = None
+        self._frame_cache.clear()
 
     @staticmethod
     def _address_candidates(base_addr: int) -> tuple[int, int]:
@@ -81,13 +156,15 @@ class InspireHandDriver:
             return base_addr, base_addr // 2
         return base_addr, base_addr
 
-    def _write_registers_with_fallback(self, base_addr: int, values: Sequence[int]) -> bool:
-        if self.instrument is None:
-            LOGGER.error("Inspire hand is not connected.")
-            return False
-
-        normalized = [int(v) & 0xFFFF for v in values]
-        for candidate in self._address_candidates(base_addr):
+    def _write_normalized_registers(self, base_addr: int, normalized: list[int]) -> Optional[int]:
+        """Write through minimalmodbus; return the address that accepted the write, or None."""
+        # Caller guarantees a connected instrument and uint16 values (minimalmodbus wants a list).
+        candidates = self._address_candidates(base_addr)
+        resolved = self._resolved_addr.get(base_addr)
+        if resolved is not None:
+            # Skip the probe that failed last time; a wrong address costs a full serial timeout.
+            candidates = (resolved,) + tuple(c for c in candidates if c != resolved)
+        for candidate in candidates:
             try:
                 self.instrument.write_registers(candidate, normalized)
                 LOGGER.debug(
@@ -95,11 +172,48 @@ class InspireHandDriver:
                     len(normalized),
                     candidate,
                 )
-                return True
+                self._resolved_addr[base_addr] = candidate
+                return candidate
             except Exception as exc:
                 LOGGER.debug("Hand register write failed at %s: %s", candidate, exc)
         LOGGER.error("Failed to write hand registers for base address %s", base_addr)
-        return False
+        return None
+
+    def _rtu_frames(self, command: list[int]) -> tuple[bytes, bytes]:
+        """Return the (request, expected reply) RTU frames for writing command at _frame_address."""
+        key = tuple(command)
+        frames = self._frame_cache.get(key)
+        if frames is None:
+            header = struct.pack(
+                ">BBHH",
+                self.config.slave_id,
+                MODBUS_WRITE_MULTIPLE_REGISTERS,
+                self._frame_address,
+                len(command),
+            )
+            request = header + struct.pack(f">B{len(command)}H", 2 * len(command), *command)
+            frames = (request + _crc16_modbus(request), header + _crc16_modbus(header))
+            if len(self._frame_cache) >= self._FRAME_CACHE_SIZE:
+                del self._frame_cache[next(iter(self._frame_cache))]  # oldest first
+            self._frame_cache[key] = frames
+        return frames
+
+    def _send_cached_frame(self, command: list[int]) -> Optional[float]:
+        """Send a cached frame; return the monotonic time it finished transmitting, or None on failure."""
+        serial_port = self.instrument.serial
+        try:
+            # Inside the try: a value outside uint16 fails struct.pack and takes the fallback path.
+            request, reply = self._rtu_frames(command)
+            serial_port.reset_input_buffer()
+            serial_port.write(request)
+            serial_port.flush()  # tcdrain: the frame is on the wire, not in the tx buffer
+            sent_at = time.monotonic()
+            if serial_port.read(len(reply)) != reply:
+                return None
+            return sent_at
+        except Exception as exc:
+            LOGGER.debug("Cached hand frame write failed: %s", exc)
+            return None
 
     def set_motor_targets(self, motor_targets: Sequence[int]) -> bool:
         """Set target angle for all 6 motors (0-1000; 65535 means no action)."""
@@ -111,7 +225,59 @@ class InspireHandDriver:
             )
             return False
 
-        return self._write_registers_with_fallback(self.ANGLE_SET_BASE_ADDR, motor_targets)
+        return self.send_motor_command([int(v) & 0xFFFF for v in motor_targets])
+
+    def _blank_command(self, no_action_value: int) -> list[int]:
+        if no_action_value == self.NO_ACTION_VALUE:
+            return list(self._NO_ACTION_COMMAND)
+        return [int(no_action_value) & 0xFFFF] * self.MOTOR_COUNT
+
+    def build_motor_command(
+        self,
+        targets: Mapping[int, int],
+        no_action_value: int = NO_ACTION_VALUE,
+    ) -> Optional[list[int]]:
+        """Build a 6-motor command from targets (no_action_value elsewhere); None on a bad index."""
+        cmd = self._blank_command(no_action_value)
+        for motor_index, target_value in targets.items():
+            if motor_index < 0 or motor_index >= self.MOTOR_COUNT:
+                LOGGER.error("Motor index out of range: %s", motor_index)
+                return None
+            cmd[motor_index] = int(target_value) & 0xFFFF
+        return cmd
+
+    def send_motor_command(self, command: list[int], hold_seconds: float = 0.0) -> bool:
+        """Write a command from build_motor_command as-is, then hold for hold_seconds."""
+        if self.instrument is None:
+            LOGGER.error("Inspire hand is not connected.")
+            return False
+        sent_at = None if self._frame_address is None else self._send_cached_frame(command)
+        if sent_at is None:
+            # First write, or the cached frame went unanswered: drop the cache (even if the address
+            # turns out unchanged) and let minimalmodbus probe the address.
+            self._forget_frames()
+            address = self._write_normalized_registers(self.ANGLE_SET_BASE_ADDR, command)
+            if address is None:
+                return False
+            self._frame_address = address
+            sent_at = time.monotonic()
+        # The hold runs from when the frame left, so the reply wait counts toward it.
+        remaining = hold_seconds - (time.monotonic() - sent_at)
+        if remaining > 0.0:
+            time.sleep(remaining)
+        return True
+
+    def set_motors(
+        self,
+        targets: Mapping[int, int],
+        hold_seconds: float = 0.0,
+        no_action_value: int = NO_ACTION_VALUE,
+    ) -> bool:
+        """Set several motors in one Modbus write; motors not in targets get no_action_value."""
+        cmd = self.build_motor_command(targets, no_action_value)
+        if cmd is None:
+            return False
+        return self.send_motor_command(cmd, hold_seconds)
 
     def move_single_motor(
         self,
@@ -123,14 +289,9 @@ class InspireHandDriver:
         if motor_index < 0 or motor_index >= self.MOTOR_COUNT:
             LOGGER.error("Motor index out of range: %s", motor_index)
             return False
-
-        cmd = [int(no_action_value) & 0xFFFF] * self.MOTOR_COUNT
+        cmd = self._blank_command(no_action_value)
         cmd[motor_index] = int(target_value) & 0xFFFF
-        ok = self.set_motor_targets(cmd)
-        if not ok:
-            return False
-        time.sleep(max(0.0, hold_seconds))
-        return True
+        return self.send_motor_command(cmd, hold_seconds)
 
     def cycle_all_motors(
         self,
@@ -142,18 +303,23 @@ class InspireHandDriver:
     ) -> bool:
         """Move each hand motor open->close->open in sequence."""
         order = list(range(self.MOTOR_COUNT)) if motor_order is None else list(motor_order)
-        all_ok = True
+        # Build every per-motor command up front so the loop is send + hold only, and a bad
+        # index is rejected before anything moves.
+        steps = []
         for idx in order:
+            open_cmd = self.build_motor_command({idx: open_value})
+            if open_cmd is None:
+                return False
+            steps.append((idx, open_cmd, self.build_motor_command({idx: close_value})))
+
+        all_ok = True
+        for idx, open_cmd, close_cmd in steps:
             LOGGER.info("Cycling hand motor %s", idx)
-            all_ok &= self.move_single_motor(idx, open_value, hold_seconds=hold_seconds)
-            all_ok &= self.move_single_motor(idx, close_value, hold_seconds=hold_seconds)
-            all_ok &= self.move_single_motor(idx, open_value, hold_seconds=hold_seconds)
+            for cmd in (open_cmd, close_cmd, open_cmd):
+                all_ok &= self.send_motor_command(cmd, hold_seconds)
             time.sleep(max(0.0, settle_seconds))
         return all_ok
 
     def set_all_motors(self, target_value: int, hold_seconds: float = 0.35) -> bool:
         """Set all motor targets to a single value."""
-        ok = self.set_motor_targets([int(target_value) & 0xFFFF] * self.MOTOR_COUNT)
-        if ok:
-            time.sleep(max(0.0, hold_seconds))
-        return ok
+        return self.send_motor_command([int(target_value) & 0xFFFF] * self.MOTOR_COUNT, hold_seconds)
@@ -4,14 +4,14 @@ import argparse
 import json
 import logging
 import math
-import statistics
 import sys
 import time
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Sequence
 
 from check_hardware import ping_host
+from drivers import XArmConfig, XArmDriver
 
 
 DEFAULT_XARM_IP = "192.168.0.203"
@@ -34,6 +34,7 @@ JOINT_LIMITS_DEG = (
     (-124.0, 124.0),  # J5
     (-360.0, 360.0),  # J6
 )
+_JOINT_LIMIT_SPANS = tuple((lower, upper, upper - lower) for lower, upper in JOINT_LIMITS_DEG)
 
 
 @dataclass
@@ -50,6 +51,10 @@ class CandidateResult:
     margin_raw: float
     total_score: float
 
+    def to_dict(self) -> dict[str, object]:
+        # All fields are flat primitives or lists of floats, so asdict's recursive copy is unnecessary.
+        return dict(self.__dict__)
+
 
 def configure_logging() -> None:
     logging.basicConfig(
@@ -64,25 +69,29 @@ def _pose_with_j1_offset(base_pose: Sequence[float], delta_j1_deg: float) -> lis
     return pose
 
 
+def _joint_margin(angle: float, lower: float, upper: float, span: float) -> float:
+    if span <= 0.0:
+        return 0.0
+    distance_to_edge = min(angle - lower, upper - angle)
+    return max(0.0, min(1.0, (2.0 * distance_to_edge) / span))
+
+
 def _joint_margin_score(angles_deg: Sequence[float]) -> float:
-    margins: list[float] = []
-    for angle, (lower, upper) in zip(angles_deg, JOINT_LIMITS_DEG):
-        if upper <= lower:
-            margins.append(0.0)
-            continue
-        distance_to_edge = min(angle - lower, upper - angle)
-        normalized = max(0.0, min(1.0, (2.0 * distance_to_edge) / (upper - lower)))
-        margins.append(normalized)
-    return min(margins) if margins else 0.0
+    return min(
+        (_joint_margin(angle, *limits) for angle, limits in zip(angles_deg, _JOINT_LIMIT_SPANS)),
+        default=0.0,
+    )
 
 
 def _candidate_margin(center_pose_deg: Sequence[float], sweep_delta_j1_deg: float) -> float:
-    left = _pose_with_j1_offset(center_pose_deg, -abs(sweep_delta_j1_deg))
-    right = _pose_with_j1_offset(center_pose_deg, abs(sweep_delta_j1_deg))
+    # The sweep only moves J1, so J2-J6 margins are shared; score J1 alone at the sweep ends.
+    delta = abs(sweep_delta_j1_deg)
+    j1 = center_pose_deg[0]
+    j1_limits = _JOINT_LIMIT_SPANS[0]
     return min(
         _joint_margin_score(center_pose_deg),
-        _joint_margin_score(left),
-        _joint_margin_score(right),
+        _joint_margin(j1 - delta, *j1_limits),
+        _joint_margin(j1 + delta, *j1_limits),
     )
 
 
@@ -97,9 +106,12 @@ def _run_sweep_benchmark(
     left_pose = _pose_with_j1_offset(center_pose_deg, -abs(sweep_delta_j1_deg))
     right_pose = _pose_with_j1_offset(center_pose_deg, abs(sweep_delta_j1_deg))
 
-    # Warmup pass to stabilize first-move effects.
-    for warmup_pose in (center_pose_deg, left_pose, right_pose, center_pose_deg):
-        if not arm.move_joints(warmup_pose, speed=speed, acceleration=acceleration, wait=True):
+    # Warmup pass to stabilize first-move effects. It is not timed, so queue the moves in the
+    # controller and only block on the last one.
+    warmup_poses = (center_pose_deg, left_pose, right_pose, center_pose_deg)
+    for index, warmup_pose in enumerate(warmup_poses, start=1):
+        wait = index == len(warmup_poses)
+        if not arm.move_joints(warmup_pose, speed=speed, acceleration=acceleration, wait=wait):
             return False, "warmup move failed", []
 
     segment_times: list[float] = []
@@ -115,20 +127,30 @@ def _run_sweep_benchmark(
     return True, "ok", segment_times
 
 
+def _mean_pstdev(values: Sequence[float]) -> tuple[float, float]:
+    # Welford single pass; statistics.mean/pstdev take exact-fraction paths we do not need here.
+    mean = 0.0
+    m2 = 0.0
+    for count, value in enumerate(values, start=1):
+        delta = value - mean
+        mean += delta / count
+        m2 += delta * (value - mean)
+    return mean, math.sqrt(m2 / len(values)) if len(values) > 1 else 0.0
+
+
 def _score_results(results: list[CandidateResult]) -> None:
     valid = [r for r in results if r.ok]
     if not valid:
         return
 
-    max_speed = max(r.speed_raw for r in valid) or 1.0
-    max_smooth = max(r.smoothness_raw for r in valid) or 1.0
-    max_margin = max(r.margin_raw for r in valid) or 1.0
+    # Gather the three metrics column-wise once instead of re-reading attributes per pass.
+    speeds, smooths, margins = zip(*((r.speed_raw, r.smoothness_raw, r.margin_raw) for r in valid))
+    max_speed = max(speeds) or 1.0
+    max_smooth = max(smooths) or 1.0
+    max_margin = max(margins) or 1.0
 
-    for r in valid:
-        speed_norm = r.speed_raw / max_speed
-        smooth_norm = r.smoothness_raw / max_smooth
-        margin_norm = r.margin_raw / max_margin
-        r.total_score = 0.50 * speed_norm + 0.35 * smooth_norm + 0.15 * margin_norm
+    for r, speed, smooth, margin in zip(valid, speeds, smooths, margins):
+        r.total_score = 0.50 * (speed / max_speed) + 0.35 * (smooth / max_smooth) + 0.15 * (margin / max_margin)
 
 
 def _print_results(results: list[CandidateResult]) -> None:
@@ -194,8 +216,6 @@ def main() -> int:
         logger.info("Precheck passed. Re-run with --execute to move hardware and run calibration.")
         return 0
 
-    from drivers import XArmConfig, XArmDriver
-
     arm = XArmDriver(XArmConfig(robot_ip=args.xarm_ip, speed=args.speed, acceleration=args.acc))
     if not arm.connect():
         logger.error("Failed to connect to xArm.")
@@ -223,8 +243,7 @@ def main() -> int:
             )
 
             if ok and segment_times:
-                mean_t = statistics.mean(segment_times)
-                std_t = statistics.pstdev(segment_times) if len(segment_times) > 1 else 0.0
+                mean_t, std_t = _mean_pstdev(segment_times)
                 speed_raw = 1.0 / max(mean_t, 1e-6)
                 cv = std_t / max(mean_t, 1e-6)
                 smooth_raw = 1.0 / max(cv, 1e-6)
@@ -270,8 +289,8 @@ def main() -> int:
                     "cycles": args.cycles,
                     "speed": args.speed,
                     "acc": args.acc,
-                    "best_candidate": asdict(best_result),
-                    "all_candidates": [asdict(r) for r in results],
+                    "best_candidate": best_result.to_dict(),
+                    "all_candidates": [r.to_dict() for r in results],
                 },
                 indent=2,
             )
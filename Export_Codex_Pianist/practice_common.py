@@ -0,0 +1,141 @@
+"""Helpers shared by the direct-control scripts (argument parsing, precheck, hand open sequence)."""
+
+from __future__ import annotations
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Sequence
+
+from check_hardware import ping_host, read_latency_timer, serial_device_access, set_latency_timer
+
+
+DEFAULT_XARM_IP = "192.168.0.203"
+DEFAULT_HAND_PORT = "/dev/ttyUSB0"
+DEFAULT_CENTER_JOINTS_DEG = (0.0, -17.0, -28.0, 0.0, 75.0, -45.0)
+DEFAULT_HOME_JOINTS_DEG = (0.0, 0.0, 0.0, 0.0, 90.0, -45.0)
+DEFAULT_FINGER_INDICES = (3, 2, 1, 0)  # index -> middle -> ring -> pinky (thumb excluded)
+
+
+def configure_logging() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+    )
+
+
+def parse_joint_targets(text: str) -> tuple[float, ...]:
+    parts = [p.strip() for p in text.split(",") if p.strip()]
+    if len(parts) != 6:
+        raise ValueError(f"Expected 6 comma-separated joint values, got {len(parts)}")
+    return tuple(float(p) for p in parts)
+
+
+def parse_finger_indices(text: str) -> tuple[int, ...]:
+    parts = [p.strip() for p in text.split(",") if p.strip()]
+    if len(parts) != 4:
+        raise ValueError("Expected exactly 4 comma-separated finger motor indices (no thumb).")
+    values = tuple(int(p) for p in parts)
+    if any(v < 0 or v > 5 for v in values):
+        raise ValueError("Finger indices must be between 0 and 5.")
+    return values
+
+
+def resolve_hand_port(requested_port: str, rs485_scan: tuple[list[object], list[object]]) -> str:
+    if requested_port != "auto":
+        return requested_port
+
+    matches, usb_ports = rs485_scan
+    if matches:
+        return matches[0].device
+    if usb_ports:
+        return usb_ports[0].device
+    return DEFAULT_HAND_PORT
+
+
+def lower_ftdi_latency(hand_port: str, logger: logging.Logger) -> None:
+    before = read_latency_timer(hand_port)
+    if before is None or before <= 1:
+        return
+    if not set_latency_timer(hand_port, 1):
+        logger.warning("Could not lower latency_timer on %s (still %s ms)", hand_port, before)
+        return
+    logger.info("Hand port latency_timer: %s ms -> %s ms", before, read_latency_timer(hand_port))
+
+
+def load_center_from_report(default_center: tuple[float, ...]) -> tuple[float, ...]:
+    report_path = Path("play_center_calibration_results.json")
+    try:
+        raw = report_path.read_bytes()
+    except OSError:
+        return default_center
+
+    try:
+        report = json.loads(raw)
+        best = report.get("best_candidate", {})
+        center = best.get("center_pose_deg")
+        if isinstance(center, list) and len(center) == 6:
+            return tuple(float(v) for v in center)
+    except Exception:
+        pass
+    return default_center
+
+
+def run_precheck(xarm_ip: str, hand_port: str, matches: list[object], logger: logging.Logger) -> bool:
+    # The ping blocks for up to a couple of seconds; probe the hand port while it runs.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        ping_future = pool.submit(ping_host, xarm_ip, 1, 2)
+        device_exists, device_access = serial_device_access(hand_port)
+        device_present = device_exists or hand_port in frozenset(getattr(port, "device", "") for port in matches)
+        hand_ok = device_present and device_access
+        ping_ok, ping_output = ping_future.result()
+
+    logger.info("Precheck xArm ping: %s", "PASS" if ping_ok else "FAIL")
+    logger.info("Precheck hand port: %s (%s)", hand_port, "PASS" if hand_ok else "FAIL")
+    latency_ms = read_latency_timer(hand_port)
+    if latency_ms is not None:
+        logger.info("Precheck hand latency_timer: %s ms", latency_ms)
+    if not ping_ok:
+        logger.warning("xArm ping output: %s", ping_output.replace("\n", " | "))
+    if device_present and not device_access:
+        logger.warning("Hand serial device exists but current user lacks read/write permissions: %s", hand_port)
+    return ping_ok and hand_ok
+
+
+def compute_strike_value(open_value: int, close_reference: int, down_fraction: float) -> int:
+    down_fraction = max(0.0, min(1.0, down_fraction))
+    value = open_value + (close_reference - open_value) * down_fraction
+    return int(round(value))
+
+
+def build_strokes(
+    hand: object,
+    finger_indices: Sequence[int],
+    strike_value: int,
+    open_value: int,
+) -> tuple[tuple[int, list[int], list[int]], ...]:
+    """Prebuild (finger, press command, release command) for each finger, in strike order."""
+    return tuple(
+        (
+            finger_idx,
+            hand.build_motor_command({finger_idx: strike_value}),
+            hand.build_motor_command({finger_idx: open_value}),
+        )
+        for finger_idx in finger_indices
+    )
+
+
+def force_full_open(hand: object, open_value: int, hold_seconds: float, finger_indices: Sequence[int], logger: logging.Logger) -> bool:
+    settle = max(0.20, hold_seconds)
+    logger.info("Force full-open step 1: all motors -> %s", open_value)
+    if not hand.set_all_motors(open_value, hold_seconds=settle):
+        return False
+
+    logger.info("Force full-open step 2: touch target fingers %s -> %s", finger_indices, open_value)
+    finger_hold = max(0.04, hold_seconds * 0.5)
+    if not hand.set_motors({finger_idx: open_value for finger_idx in finger_indices}, hold_seconds=finger_hold):
+        return False
+
+    logger.info("Force full-open step 3: all motors -> %s", open_value)
+    return hand.set_all_motors(open_value, hold_seconds=settle)
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import os
+
+
+def pin_host_threads_env(device: str) -> bool:
+    # With the sim and the networks on the GPU, the host side is a single Python loop launching
+    # kernels; a full CPU threadpool only oversubscribes the cores. Must run before Kit/torch
+    # start up; explicit user settings win.
+    if not device.startswith("cuda"):
+        return False
+    os.environ.setdefault("OMP_NUM_THREADS", "1")
+    os.environ.setdefault("MKL_NUM_THREADS", "1")
+    return True
+
+
+def pin_torch_threads() -> None:
+    import torch
+
+    torch.set_num_threads(1)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:  # inter-op pool already started by an earlier torch user in Kit
+        pass
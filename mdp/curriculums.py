@@ -10,21 +10,39 @@ class PianistCurriculum:
         return sequenced_note_curriculum(env, env_ids)
 
 
+# Note offsets pushed to each device once; the curriculum runs every reset batch.
+_NOTES_X_OFFSETS_CACHE: dict[torch.device, torch.Tensor] = {}
+
+
+def _notes_x_offsets(device) -> torch.Tensor:
+    offsets = _NOTES_X_OFFSETS_CACHE.get(device)
+    if offsets is None:
+        offsets = torch.tensor(PianistCurriculum.NOTE_OFFSETS_Y, device=device)
+        _NOTES_X_OFFSETS_CACHE[device] = offsets
+    return offsets
+
+
 def sequenced_note_curriculum(env, env_ids):
     # The 7 notes of C Major Scale (relative coords to Middle C)
     # [C4, D4, E4, F4, G4, A4, B4]
-    notes_x_offsets = torch.tensor([0.0, 0.0235, 0.047, 0.0705, 0.094, 0.1175, 0.141], device=env.device)
+    notes_x_offsets = _notes_x_offsets(env.device)
 
     # Every 500 steps, pick a new target from ONLY these 7 notes
     num_notes = len(notes_x_offsets)
-    indices = torch.randint(0, num_notes, (len(env_ids),), device=env.device)
+    scratch = getattr(env, "_curriculum_idx_scratch", None)
+    if scratch is not None:
+        indices = scratch[: len(env_ids)].random_(0, num_notes)
+    else:
+        indices = torch.randint(0, num_notes, (len(env_ids),), device=env.device)
 
     # Update the environment's current_midi_goal
     # Assuming base_c4_pos is [0.5, 0.0, 0.2]
-    new_goals = env.base_c4_pos[env_ids].clone()
+    # env_ids is an index tensor, so this gather is already a fresh copy (no clone needed).
+    new_goals = env.base_c4_pos[env_ids]
     new_goals[:, 1] += notes_x_offsets[indices]  # Offset along the keyboard Y-axis
 
-    env.current_target_pos[env_ids] = new_goals
-    env.current_note_indices[env_ids] = indices
-    env.current_midi_goal[env_ids] = 0.0
-    env.current_midi_goal[env_ids, indices] = 1.0
+    # index_copy_ along dim 0: one scatter kernel per buffer, no per-env work on the host.
+    env.current_target_pos.index_copy_(0, env_ids, new_goals)
+    env.current_note_indices.index_copy_(0, env_ids, indices)
+    midi_goal = env.current_midi_goal
+    midi_goal.index_copy_(0, env_ids, torch.nn.functional.one_hot(indices, midi_goal.shape[1]).to(midi_goal.dtype))
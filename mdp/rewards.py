@@ -2,21 +2,39 @@ import torch
 from isaaclab.managers import SceneEntityCfg
 from isaaclab.assets import Articulation
 
+@torch.jit.script
+def _nearest_tip_reward(tips_w: torch.Tensor, target_pos: torch.Tensor) -> torch.Tensor:
+    # min over squared distances, so only the winning tip pays for the sqrt
+    diff = tips_w - target_pos.unsqueeze(1)
+    min_sq = (diff * diff).sum(dim=-1).amin(dim=1)
+    return torch.reciprocal(1.0 + torch.sqrt(min_sq))
+
 def track_midi_goal(env, finger_cfg: SceneEntityCfg, target_pos: torch.Tensor | None = None) -> torch.Tensor:
     # Reward for Index (7), Middle (8), and Ring (9) fingers being near target_pos
     asset: Articulation = env.scene[finger_cfg.name]
     if target_pos is None:
         target_pos = env.current_target_pos
-    tips_w = asset.data.body_state_w[:, finger_cfg.body_ids, :3]
-    dist = torch.norm(tips_w - target_pos.unsqueeze(1), dim=-1)
-    return 1.0 / (1.0 + torch.min(dist, dim=1)[0])
+    tips_w = asset.data.body_pos_w[:, finger_cfg.body_ids]
+    return _nearest_tip_reward(tips_w, target_pos)
+
+@torch.jit.script
+def _pair_norm(a: torch.Tensor, b: torch.Tensor) -> torch.Tensor:
+    return torch.sqrt(a * a + b * b)
 
 def finger_discipline_penalty(env, asset_cfg: SceneEntityCfg) -> torch.Tensor:
     # Penalize Thumb (6) and Pinky (10) if they deviate from 0.0 (tucked)
     asset: Articulation = env.scene[asset_cfg.name]
-    return torch.norm(asset.data.joint_pos[:, [6, 10]], dim=1)
+    joint_pos = asset.data.joint_pos
+    # column views instead of a [6, 10] gather
+    return _pair_norm(joint_pos[:, 6], joint_pos[:, 10])
+
+@torch.jit.script
+def _force_band_count(force_z: torch.Tensor) -> torch.Tensor:
+    # 2 < |f| < 5 compared on f*f, summed straight from the bool mask
+    sq = force_z * force_z
+    return ((sq > 4.0) & (sq < 25.0)).sum(dim=1, dtype=torch.float32)
 
 def piano_force_reward(env, sensor_cfg: SceneEntityCfg) -> torch.Tensor:
     # Reward for 2N-5N force on the key
-    force = env.scene.sensors[sensor_cfg.name].data.net_forces_w[:, sensor_cfg.body_ids, 2].abs()
-    return torch.where((force > 2.0) & (force < 5.0), 1.0, 0.0).sum(dim=1)
+    force_z = env.scene.sensors[sensor_cfg.name].data.net_forces_w[:, sensor_cfg.body_ids, 2]
+    return _force_band_count(force_z)
@@ -80,6 +80,9 @@ class PianistEnvCfg(DirectRLEnvCfg):
     finger_action_scale_rad = 0.60
     midi_notes = C_MAJOR_NOTES
     curriculum_update_steps = 500
+    # Run a full write/forward/update before composing the hand pose in _apply_action. The
+    # link_eef pose is already current after every physics step and reset, so this is off.
+    sync_kinematics_before_hand_pose = False
 
     def __post_init__(self):
         super().__post_init__()
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 import argparse
+import operator
+import os
 import re
+import stat
 import subprocess
 import sys
+import time
 from typing import Iterable
 
 try:
@@ -14,6 +18,11 @@ except Exception as exc:  # pragma: no cover - dependency availability varies
 else:
     SERIAL_IMPORT_ERROR = None
 
+try:
+    import icmplib
+except Exception:  # pragma: no cover - optional; ping_host falls back to the ping binary
+    icmplib = None
+
 
 DEFAULT_XARM_IP = "192.168.0.203"
 DEFAULT_KEYWORDS = (
@@ -27,40 +36,123 @@ DEFAULT_KEYWORDS = (
     "uart",
 )
 
-KNOWN_RS485_ADAPTER_IDS = {
+KNOWN_RS485_ADAPTER_IDS = frozenset({
     (0x1A86, 0x7523),  # QinHeng/WCH CH340
     (0x10C4, 0xEA60),  # Silicon Labs CP210x
     (0x0403, 0x6001),  # FTDI FT232
     (0x067B, 0x2303),  # Prolific PL2303
-}
+})
+
+# Port enumeration walks sysfs/udev (WMI on Windows); reuse recent scans.
+RS485_SCAN_MAX_AGE_SECONDS = 5.0
+_RS485_SCAN_CACHE: dict[tuple[str, ...], tuple[float, tuple[list[object], list[object]]]] = {}
+
+# usb-serial drivers (FTDI in particular) batch RX data for latency_timer ms (default 16).
+LATENCY_TIMER_SYSFS = "/sys/bus/usb-serial/devices/{tty}/latency_timer"
+
+# Text fields of a pyserial ListPortInfo searched for adapter keywords, fetched in one call.
+_PORT_TEXT_FIELDS = operator.attrgetter("device", "description", "manufacturer", "product", "hwid")
+_USB_SERIAL_DEVICE_PREFIXES = ("/dev/ttyUSB", "/dev/ttyACM")
+
+_PING_SUMMARY_RE = re.compile(r"(\d+)\s+packets transmitted,\s+(\d+)\s+received")
+_PING_RTT_RE = re.compile(r"min/avg/max(?:/mdev)?\s*=\s*([0-9./]+)\s*ms")
 
 
 def ping_host(ip: str, timeout_seconds: int, count: int) -> tuple[bool, str]:
+    if icmplib is not None:
+        try:
+            # Unprivileged ICMP datagram socket: no fork/exec of the ping binary.
+            host = icmplib.ping(ip, count=count, timeout=timeout_seconds, privileged=False)
+        except Exception:
+            pass  # e.g. ping_group_range excludes this user; the setuid binary still works
+        else:
+            # Same summary lines as iputils ping so _print_ping_summary handles both.
+            output = f"{host.packets_sent} packets transmitted, {host.packets_received} received"
+            if host.is_alive:
+                output += f"\nrtt min/avg/max = {host.min_rtt:.3f}/{host.avg_rtt:.3f}/{host.max_rtt:.3f} ms"
+            return host.is_alive, output
+
     cmd = ["ping", "-c", str(count), "-W", str(timeout_seconds), ip]
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    output = (proc.stdout + proc.stderr).strip()
+    # Capture raw bytes and decode the joined output once; text=True would wrap both pipes in
+    # locale decoders and raise on stray non-UTF-8 bytes from localized ping builds.
+    proc = subprocess.run(cmd, capture_output=True)
+    output = (proc.stdout + proc.stderr).strip().decode("utf-8", errors="replace")
     return proc.returncode == 0, output
 
 
+def _latency_timer_path(port: str) -> str:
+    tty = os.path.basename(os.path.realpath(port))
+    return LATENCY_TIMER_SYSFS.format(tty=tty)
+
+
+def read_latency_timer(port: str) -> int | None:
+    """Return the usb-serial latency_timer (ms) for a port, or None if not exposed."""
+    try:
+        with open(_latency_timer_path(port), "rb") as handle:
+            return int(handle.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def set_latency_timer(port: str, value_ms: int = 1) -> bool:
+    """Lower the usb-serial latency_timer, falling back to `setserial low_latency`."""
+    try:
+        fd = os.open(_latency_timer_path(port), os.O_WRONLY)
+    except FileNotFoundError:
+        return False
+    except PermissionError:
+        try:
+            proc = subprocess.run(["setserial", port, "low_latency"], capture_output=True)
+        except OSError:
+            return False
+        return proc.returncode == 0
+
+    try:
+        os.write(fd, str(int(value_ms)).encode("ascii"))
+        return True
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+
+
+def serial_device_access(port: str) -> tuple[bool, bool]:
+    """Return (exists, readable_and_writable) for a device node from a single stat()."""
+    try:
+        st = os.stat(port)
+    except OSError:
+        return False, False
+    if not hasattr(os, "geteuid"):
+        return True, os.access(port, os.R_OK | os.W_OK)
+
+    euid = os.geteuid()
+    if euid == 0:
+        return True, True
+    # Permission classes are exclusive: the first one that matches decides, as in the kernel.
+    if st.st_uid == euid:
+        wanted = stat.S_IRUSR | stat.S_IWUSR
+    elif st.st_gid == os.getegid() or st.st_gid in os.getgroups():
+        wanted = stat.S_IRGRP | stat.S_IWGRP
+    else:
+        wanted = stat.S_IROTH | stat.S_IWOTH
+    return True, (st.st_mode & wanted) == wanted
+
+
 def _port_blob(port: object) -> str:
-    fields = [
-        getattr(port, "device", ""),
-        getattr(port, "description", ""),
-        getattr(port, "manufacturer", ""),
-        getattr(port, "product", ""),
-        getattr(port, "hwid", ""),
-    ]
-    return " | ".join([f for f in fields if f]).lower()
+    return " | ".join([f for f in _PORT_TEXT_FIELDS(port) if f]).lower()
 
 
-def _is_usb_serial(port: object) -> bool:
+def _is_usb_serial(port: object) -> tuple[bool, str | None]:
+    # Returns (is USB serial, the port's text if it had to be built) so the keyword scan can
+    # reuse it. pyserial fills vid/pid only for USB-attached ports on every platform. Windows
+    # names ports COMn, so without this each one there would fall through to the text scan.
+    if getattr(port, "vid", None) is not None:
+        return True, None
     device = getattr(port, "device", "") or ""
+    if device.startswith(_USB_SERIAL_DEVICE_PREFIXES):
+        return True, None
     blob = _port_blob(port)
-    return (
-        device.startswith("/dev/ttyUSB")
-        or device.startswith("/dev/ttyACM")
-        or "usb" in blob
-    )
+    return "usb" in blob, blob
 
 
 def find_rs485_ports(keywords: Iterable[str]) -> tuple[list[object], list[object]]:
@@ -68,33 +160,57 @@ def find_rs485_ports(keywords: Iterable[str]) -> tuple[list[object], list[object
         return [], []
 
     all_ports = list(list_ports.comports())
-    usb_ports = [p for p in all_ports if _is_usb_serial(p)]
-    lowered = tuple(k.lower() for k in keywords)
+    # One alternation scans each blob once however many keywords there are; an empty
+    # alternation would match everything, so no keywords means no text matches.
+    lowered = [re.escape(k.lower()) for k in keywords if k]
+    keyword_pattern = re.compile("|".join(lowered)) if lowered else None
+    usb_ports = []
     matches = []
-    for port in usb_ports:
-        text_match = any(k in _port_blob(port) for k in lowered)
-        id_match = (getattr(port, "vid", None), getattr(port, "pid", None)) in KNOWN_RS485_ADAPTER_IDS
-        if text_match or id_match:
+    for port in all_ports:
+        is_usb, blob = _is_usb_serial(port)
+        if not is_usb:
+            continue
+        usb_ports.append(port)
+        if (getattr(port, "vid", None), getattr(port, "pid", None)) in KNOWN_RS485_ADAPTER_IDS:
             matches.append(port)
+        elif keyword_pattern is not None:
+            if blob is None:
+                blob = _port_blob(port)
+            if keyword_pattern.search(blob) is not None:
+                matches.append(port)
     return matches, usb_ports
 
 
+def find_rs485_ports_cached(
+    keywords: Iterable[str],
+    max_age_seconds: float = RS485_SCAN_MAX_AGE_SECONDS,
+) -> tuple[list[object], list[object]]:
+    """Return find_rs485_ports(keywords), reusing a scan younger than max_age_seconds."""
+    key = tuple(keywords)
+    now = time.monotonic()
+    cached = _RS485_SCAN_CACHE.get(key)
+    if cached is not None and now - cached[0] < max_age_seconds:
+        return cached[1]
+    result = find_rs485_ports(key)
+    _RS485_SCAN_CACHE[key] = (now, result)
+    return result
+
+
 def _print_port(port: object) -> None:
-    device = getattr(port, "device", "unknown")
-    description = getattr(port, "description", "n/a")
-    manufacturer = getattr(port, "manufacturer", "n/a")
-    product = getattr(port, "product", "n/a")
-    hwid = getattr(port, "hwid", "n/a")
-    print(f"- {device}")
-    print(f"  description : {description}")
-    print(f"  manufacturer: {manufacturer}")
-    print(f"  product     : {product}")
-    print(f"  hwid        : {hwid}")
+    device, description, manufacturer, product, hwid = _PORT_TEXT_FIELDS(port)
+    # One write per port rather than one per field.
+    print(
+        f"- {device}\n"
+        f"  description : {description}\n"
+        f"  manufacturer: {manufacturer}\n"
+        f"  product     : {product}\n"
+        f"  hwid        : {hwid}"
+    )
 
 
 def _print_ping_summary(ping_output: str) -> None:
-    summary_match = re.search(r"(\d+)\s+packets transmitted,\s+(\d+)\s+received", ping_output)
-    rtt_match = re.search(r"min/avg/max(?:/mdev)?\s*=\s*([0-9./]+)\s*ms", ping_output)
+    summary_match = _PING_SUMMARY_RE.search(ping_output)
+    rtt_match = _PING_RTT_RE.search(ping_output)
 
     if summary_match:
         sent, received = summary_match.groups()
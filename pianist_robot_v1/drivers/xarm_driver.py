@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Optional, Sequence
 
@@ -14,6 +15,9 @@ except Exception as exc:  # pragma: no cover - import availability depends on en
 
 LOGGER = logging.getLogger(__name__)
 
+# Joint targets closer than this (degrees, per joint) to the last command are treated as already reached.
+JOINT_CMD_EPSILON_DEG = 1e-3
+
 
 @dataclass
 class XArmConfig:
@@ -28,12 +32,15 @@ class XArmDriver:
     def __init__(self, config: XArmConfig) -> None:
         self.config = config
         self.api: Optional[XArmAPI] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._last_joint_cmd: Optional[tuple[float, ...]] = None
 
     def connect(self) -> bool:
         if XArmAPI is None:
             LOGGER.error("xarm-python-sdk is unavailable: %s", _XARM_IMPORT_ERROR)
             return False
 
+        self._last_joint_cmd = None
         try:
             self.api = XArmAPI(self.config.robot_ip, do_not_open=False, is_radian=False)
             self.api.motion_enable(enable=True)
@@ -53,6 +60,9 @@ class XArmDriver:
             return False
 
     def disconnect(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
         if self.api is None:
             return
 
@@ -63,6 +73,12 @@ class XArmDriver:
             LOGGER.warning("xArm disconnect raised: %s", exc)
         finally:
             self.api = None
+            self._last_joint_cmd = None
+
+    def is_at_pose(self, joint_angles_deg: Sequence[float], eps_deg: float = JOINT_CMD_EPSILON_DEG) -> bool:
+        """True if the last completed joint command is within eps_deg of joint_angles_deg on every joint."""
+        last = self._last_joint_cmd
+        return last is not None and all(abs(a - b) < eps_deg for a, b in zip(joint_angles_deg, last))
 
     def move_joints(
         self,
@@ -77,12 +93,18 @@ class XArmDriver:
         if len(joint_angles_deg) != 6:
             LOGGER.error("Expected 6 joint angles for xArm, got %s", len(joint_angles_deg))
             return False
+        target = tuple(joint_angles_deg)  # no copy when the caller already passes a tuple
+        if self.is_at_pose(target):
+            LOGGER.info("xArm already at joint target: %s", target)
+            return True
 
         cmd_speed = self.config.speed if speed is None else speed
         cmd_acc = self.config.acceleration if acceleration is None else acceleration
+        # Forget the cached pose until this command succeeds; an aborted move leaves the arm in between.
+        self._last_joint_cmd = None
         try:
             code = self.api.set_servo_angle(
-                angle=list(joint_angles_deg),
+                angle=target,
                 speed=cmd_speed,
                 mvacc=cmd_acc,
                 wait=wait,
@@ -91,8 +113,22 @@ class XArmDriver:
             if code != 0:
                 LOGGER.error("xArm set_servo_angle failed with code %s", code)
                 return False
-            LOGGER.info("xArm moved to joint target: %s", list(joint_angles_deg))
+            # A wait=False move is only queued; leave the cache cleared so a later wait=True call
+            # to the same target still blocks until the arm actually gets there.
+            self._last_joint_cmd = target if wait else None
+            LOGGER.info("xArm moved to joint target: %s", target)
             return True
         except Exception as exc:
             LOGGER.exception("xArm joint move failed: %s", exc)
             return False
+
+    def move_joints_async(
+        self,
+        joint_angles_deg: Sequence[float],
+        speed: Optional[float] = None,
+        acceleration: Optional[float] = None,
+    ) -> Future[bool]:
+        """Run a blocking move_joints on a background worker so the caller can drive the hand meanwhile."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="xarm-motion")
+        return self._executor.submit(self.move_joints, joint_angles_deg, speed, acceleration, True)
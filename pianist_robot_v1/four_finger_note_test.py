@@ -1,120 +1,38 @@
 from __future__ import annotations
 
 import argparse
-import json
 import logging
-import os
 import sys
-from pathlib import Path
-
-from check_hardware import DEFAULT_KEYWORDS, find_rs485_ports, ping_host
-
-
-DEFAULT_XARM_IP = "192.168.0.203"
-DEFAULT_HAND_PORT = "/dev/ttyUSB0"
-DEFAULT_CENTER_JOINTS_DEG = (0.0, -17.0, -28.0, 0.0, 75.0, -45.0)
-DEFAULT_HOME_JOINTS_DEG = (0.0, 0.0, 0.0, 0.0, 90.0, -45.0)
-DEFAULT_FINGER_INDICES = (3, 2, 1, 0)  # index -> middle -> ring -> pinky (thumb excluded)
-
-
-def configure_logging() -> None:
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-    )
-
-
-def _parse_joint_targets(text: str) -> list[float]:
-    parts = [p.strip() for p in text.split(",") if p.strip()]
-    if len(parts) != 6:
-        raise ValueError(f"Expected 6 comma-separated joint values, got {len(parts)}")
-    return [float(p) for p in parts]
-
-
-def _parse_finger_indices(text: str) -> list[int]:
-    parts = [p.strip() for p in text.split(",") if p.strip()]
-    if len(parts) != 4:
-        raise ValueError("Expected exactly 4 comma-separated finger motor indices (no thumb).")
-    values = [int(p) for p in parts]
-    if any(v < 0 or v > 5 for v in values):
-        raise ValueError("Finger indices must be between 0 and 5.")
-    return values
-
-
-def _resolve_hand_port(requested_port: str) -> str:
-    if requested_port != "auto":
-        return requested_port
-
-    matches, usb_ports = find_rs485_ports(DEFAULT_KEYWORDS)
-    if matches:
-        return matches[0].device
-    if usb_ports:
-        return usb_ports[0].device
-    return DEFAULT_HAND_PORT
-
-
-def _load_center_from_report(default_center: list[float]) -> list[float]:
-    report_path = Path("play_center_calibration_results.json")
-    if not report_path.exists():
-        return default_center
-
-    try:
-        report = json.loads(report_path.read_text(encoding="utf-8"))
-        best = report.get("best_candidate", {})
-        center = best.get("center_pose_deg")
-        if isinstance(center, list) and len(center) == 6:
-            return [float(v) for v in center]
-    except Exception:
-        pass
-    return default_center
-
-
-def _run_precheck(xarm_ip: str, hand_port: str, logger: logging.Logger) -> bool:
-    matches, _ = find_rs485_ports(DEFAULT_KEYWORDS)
-    ping_ok, ping_output = ping_host(xarm_ip, timeout_seconds=1, count=2)
-
-    device_present = any(getattr(port, "device", "") == hand_port for port in matches) or os.path.exists(hand_port)
-    device_access = os.access(hand_port, os.R_OK | os.W_OK) if os.path.exists(hand_port) else False
-    hand_ok = device_present and device_access
-
-    logger.info("Precheck xArm ping: %s", "PASS" if ping_ok else "FAIL")
-    logger.info("Precheck hand port: %s (%s)", hand_port, "PASS" if hand_ok else "FAIL")
-    if not ping_ok:
-        logger.warning("xArm ping output: %s", ping_output.replace("\n", " | "))
-    if device_present and not device_access:
-        logger.warning("Hand serial device exists but current user lacks read/write permissions: %s", hand_port)
-    return ping_ok and hand_ok
-
-
-def _compute_strike_value(open_value: int, close_reference: int, down_fraction: float) -> int:
-    down_fraction = max(0.0, min(1.0, down_fraction))
-    value = open_value + (close_reference - open_value) * down_fraction
-    return int(round(value))
-
-
-def _force_full_open(hand: object, open_value: int, hold_seconds: float, finger_indices: list[int], logger: logging.Logger) -> bool:
-    settle = max(0.20, hold_seconds)
-    logger.info("Force full-open step 1: all motors -> %s", open_value)
-    if not hand.set_all_motors(open_value, hold_seconds=settle):
-        return False
-
-    logger.info("Force full-open step 2: touch each target finger -> %s", open_value)
-    per_finger_hold = max(0.04, hold_seconds * 0.5)
-    for finger_idx in finger_indices:
-        if not hand.move_single_motor(finger_idx, open_value, hold_seconds=per_finger_hold):
-            return False
-
-    logger.info("Force full-open step 3: all motors -> %s", open_value)
-    return hand.set_all_motors(open_value, hold_seconds=settle)
+from concurrent.futures import ThreadPoolExecutor
+
+from check_hardware import DEFAULT_KEYWORDS, find_rs485_ports_cached
+from drivers import InspireHandConfig, InspireHandDriver, XArmConfig, XArmDriver
+from practice_common import (
+    DEFAULT_CENTER_JOINTS_DEG,
+    DEFAULT_FINGER_INDICES,
+    DEFAULT_HAND_PORT,
+    DEFAULT_HOME_JOINTS_DEG,
+    DEFAULT_XARM_IP,
+    build_strokes,
+    compute_strike_value,
+    configure_logging,
+    force_full_open,
+    load_center_from_report,
+    lower_ftdi_latency,
+    parse_finger_indices,
+    parse_joint_targets,
+    resolve_hand_port,
+    run_precheck,
+)
 
 
 def run_test(
     xarm_ip: str,
     hand_port: str,
     hand_slave_id: int,
-    center_joints: list[float],
-    home_joints: list[float],
-    finger_indices: list[int],
+    center_joints: tuple[float, ...],
+    home_joints: tuple[float, ...],
+    finger_indices: tuple[int, ...],
     loops: int,
     open_value: int,
     close_reference: int,
@@ -125,39 +43,38 @@ def run_test(
     arm_acc: float,
     return_home: bool,
 ) -> bool:
-    from drivers import InspireHandConfig, InspireHandDriver, XArmConfig, XArmDriver
-
     logger = logging.getLogger("four_finger_note_test")
-    strike_value = _compute_strike_value(open_value, close_reference, down_fraction)
+    strike_value = compute_strike_value(open_value, close_reference, down_fraction)
     logger.info("Computed strike value: %s (open=%s, close_ref=%s, down_fraction=%.2f)",
                 strike_value, open_value, close_reference, down_fraction)
 
     arm = XArmDriver(XArmConfig(robot_ip=xarm_ip, speed=arm_speed, acceleration=arm_acc))
-    hand = InspireHandDriver(InspireHandConfig(port=hand_port, slave_id=hand_slave_id))
+    hand = InspireHandDriver(InspireHandConfig(port=hand_port, slave_id=hand_slave_id, low_latency=True))
+    strokes = build_strokes(hand, finger_indices, strike_value, open_value)
 
     arm_ok = False
     hand_ok = False
+    center_move = None
     test_ok = False
     try:
-        logger.info("Connecting xArm at %s", xarm_ip)
-        arm_ok = arm.connect()
+        logger.info("Connecting xArm at %s and Inspire hand on %s (slave %s)", xarm_ip, hand_port, hand_slave_id)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            arm_connect = pool.submit(arm.connect)
+            hand_connect = pool.submit(hand.connect)
+            arm_ok = arm_connect.result()
+            hand_ok = hand_connect.result()
         if not arm_ok:
             logger.error("xArm connection failed.")
             return False
-
-        logger.info("Moving xArm to play center pose: %s", center_joints)
-        if not arm.move_joints(center_joints, speed=arm_speed, acceleration=arm_acc, wait=True):
-            logger.error("Failed to move xArm to center pose.")
-            return False
-
-        logger.info("Connecting Inspire hand on %s (slave %s)", hand_port, hand_slave_id)
-        hand_ok = hand.connect()
         if not hand_ok:
             logger.error("Inspire hand connection failed.")
             return False
 
+        logger.info("Moving xArm to play center pose: %s", center_joints)
+        center_move = arm.move_joints_async(center_joints, speed=arm_speed, acceleration=arm_acc)
+
         logger.info("Opening hand fully before note loop (target=%s)", open_value)
-        if not _force_full_open(
+        if not force_full_open(
             hand=hand,
             open_value=open_value,
             hold_seconds=max(press_hold, release_hold),
@@ -167,19 +84,23 @@ def run_test(
             logger.error("Failed to open hand fully.")
             return False
 
+        if not center_move.result():
+            logger.error("Failed to move xArm to center pose.")
+            return False
+
         for loop_idx in range(loops):
-            logger.info("Loop %s/%s", loop_idx + 1, loops)
-            for finger_idx in finger_indices:
-                logger.info("Finger motor %s: press -> release", finger_idx)
-                if not hand.move_single_motor(finger_idx, strike_value, hold_seconds=press_hold):
+            logger.debug("Loop %s/%s", loop_idx + 1, loops)
+            for finger_idx, press_cmd, release_cmd in strokes:
+                logger.debug("Finger motor %s: press -> release", finger_idx)
+                if not hand.send_motor_command(press_cmd, hold_seconds=press_hold):
                     logger.error("Press command failed for motor %s", finger_idx)
                     return False
-                if not hand.move_single_motor(finger_idx, open_value, hold_seconds=release_hold):
+                if not hand.send_motor_command(release_cmd, hold_seconds=release_hold):
                     logger.error("Release command failed for motor %s", finger_idx)
                     return False
 
         logger.info("Final full open command")
-        if not _force_full_open(
+        if not force_full_open(
             hand=hand,
             open_value=open_value,
             hold_seconds=max(press_hold, release_hold),
@@ -196,11 +117,15 @@ def run_test(
         if hand_ok:
             hand.disconnect()
         if arm_ok:
-            if return_home:
-                logger.info("Returning xArm to home pose: %s", home_joints)
-                arm.move_joints(home_joints, speed=arm_speed, acceleration=arm_acc, wait=True)
-            elif not test_ok:
-                logger.warning("Test did not complete. Returning xArm to home pose for safety.")
+            if center_move is not None and not center_move.done():
+                logger.info("Waiting for xArm center move to finish before cleanup.")
+                center_move.result()
+            should_home = return_home or not test_ok
+            if should_home and not arm.is_at_pose(home_joints):
+                if return_home:
+                    logger.info("Returning xArm to home pose: %s", home_joints)
+                else:
+                    logger.warning("Test did not complete. Returning xArm to home pose for safety.")
                 arm.move_joints(home_joints, speed=arm_speed, acceleration=arm_acc, wait=True)
             arm.disconnect()
 
@@ -273,23 +198,25 @@ def main() -> int:
     logger = logging.getLogger("four_finger_note_test")
 
     try:
-        center_joints = _parse_joint_targets(args.center_joints)
-        home_joints = _parse_joint_targets(args.home_joints)
-        finger_indices = _parse_finger_indices(args.finger_indices)
+        center_joints = parse_joint_targets(args.center_joints)
+        home_joints = parse_joint_targets(args.home_joints)
+        finger_indices = parse_finger_indices(args.finger_indices)
     except ValueError as exc:
         logger.error("%s", exc)
         return 2
 
     if args.use_calibration_center:
-        center_joints = _load_center_from_report(center_joints)
+        center_joints = load_center_from_report(center_joints)
         logger.info("Using center pose from calibration report: %s", center_joints)
 
-    hand_port = _resolve_hand_port(args.hand_port)
+    rs485_scan = find_rs485_ports_cached(DEFAULT_KEYWORDS)
+    hand_port = resolve_hand_port(args.hand_port, rs485_scan)
     logger.info("Resolved hand port: %s", hand_port)
+    lower_ftdi_latency(hand_port, logger)
 
     precheck_ok = True
     if not args.skip_precheck:
-        precheck_ok = _run_precheck(args.xarm_ip, hand_port, logger)
+        precheck_ok = run_precheck(args.xarm_ip, hand_port, rs485_scan[0], logger)
         if not precheck_ok and not args.force:
             logger.error("Precheck failed. Aborting test.")
             logger.error("Use --force to run anyway, or fix connectivity and retry.")
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+
+from isaaclab.app import AppLauncher
+
+parser = argparse.ArgumentParser()
+AppLauncher.add_app_launcher_args(parser)
+parser.add_argument("--stage", required=True)
+parser.add_argument(
+    "--mode",
+    choices=("check", "inspect", "both"),
+    default="both",
+    help="check: assembly paths and fixed joints; inspect: prim children; both: one Kit launch for both",
+)
+args = parser.parse_args()
+
+# Avoid interactive EULA prompt in non-interactive checks.
+os.environ.setdefault("OMNI_KIT_ACCEPT_EULA", "YES")
+stage_path = Path(args.stage).expanduser().resolve()
+
+app_launcher = AppLauncher(args)
+simulation_app = app_launcher.app
+
+import omni.usd
+from pxr import Sdf, UsdPhysics
+
+ctx = omni.usd.get_context()
+opened = ctx.open_stage(str(stage_path))
+stage = ctx.get_stage()
+print(f"stage_opened={opened}", flush=True)
+print(f"stage_path={stage_path}", flush=True)
+
+check_paths = [
+    "/pianist_robot/arm/link_eef",
+    "/pianist_robot/arm/link_eef/adapter",
+    "/pianist_robot/arm/link_eef/hand",
+]
+hand_root_candidates = [
+    "/pianist_robot/arm/link_eef/hand/base",
+    "/pianist_robot/arm/link_eef/hand/hand_base_link",
+    "/pianist_robot/arm/link_eef/adapter/hand/base",
+    "/pianist_robot/arm/link_eef/adapter/hand/hand_base_link",
+    # Legacy non-nested assembly paths (kept for compatibility).
+    "/pianist_robot/hand/base",
+    "/pianist_robot/hand/hand_base_link",
+]
+joints = [
+    "/pianist_robot/joint_arm_to_adapter",
+    "/pianist_robot/joint_adapter_to_hand",
+]
+inspect_roots = [
+    "/pianist_robot/arm",
+    "/pianist_robot/arm/link_eef/adapter",
+    "/pianist_robot/arm/link_eef/hand",
+    "/pianist_robot/arm/link_eef/adapter/hand",
+]
+inspect_paths = [
+    "/pianist_robot/arm/link_eef",
+    "/pianist_robot/arm/link_eef/adapter",
+    "/pianist_robot/arm/link_eef/adapter/geometry",
+    "/pianist_robot/arm/link_eef/hand/hand_base_link",
+    "/pianist_robot/arm/link_eef/hand/base",
+    "/pianist_robot/arm/link_eef/adapter/hand/hand_base_link",
+    "/pianist_robot/arm/link_eef/adapter/hand/base",
+]
+
+run_check = args.mode in ("check", "both")
+run_inspect = args.mode in ("inspect", "both")
+
+wanted: list[str] = []
+if run_check:
+    wanted += check_paths + hand_root_candidates + joints
+if run_inspect:
+    wanted += inspect_roots + inspect_paths
+# Look every distinct path up once, up front; the two reports share several prims.
+prims = {p: stage.GetPrimAtPath(Sdf.Path(p)) for p in dict.fromkeys(wanted)}
+
+if run_check:
+    for p in check_paths + hand_root_candidates:
+        print(f"{p}: {'OK' if prims[p].IsValid() else 'MISSING'}", flush=True)
+
+    for jp in joints:
+        prim = prims[jp]
+        if not prim.IsValid():
+            print(f"{jp}: MISSING", flush=True)
+            continue
+        joint = UsdPhysics.FixedJoint(prim)
+        body0 = [str(t) for t in joint.GetBody0Rel().GetTargets()]
+        body1 = [str(t) for t in joint.GetBody1Rel().GetTargets()]
+        print(f"{jp}: OK", flush=True)
+        print(f"  body0={body0}", flush=True)
+        print(f"  body1={body1}", flush=True)
+
+if run_inspect:
+    for root in inspect_roots:
+        prim = prims[root]
+        print(f"[{root}] valid={prim.IsValid()}", flush=True)
+        if prim.IsValid():
+            children = prim.GetChildren()
+            print("  children:", [c.GetName() for c in children][:40], flush=True)
+
+    for p in inspect_paths:
+        print(f"{p}: {'OK' if prims[p].IsValid() else 'MISSING'}", flush=True)
+
+simulation_app.close()
@@ -5,13 +5,21 @@ import json
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
+try:
+    import orjson
+except ImportError:  # optional C parser; json.loads reads the same bytes
+    orjson = None
 
-def _validate_vec3(name: str, value: Any) -> list[float]:
+_XFORM_OP_ORDER = 'uniform token[] xformOpOrder = ["xformOp:translate", "xformOp:rotateXYZ", "xformOp:scale"]'
+
+
+def _validate_vec3(name: str, value: Any) -> tuple[float, float, float]:
     if not isinstance(value, list) or len(value) != 3:
         raise ValueError(f"{name} must be a 3-element list")
-    return [float(v) for v in value]
+    x, y, z = value
+    return float(x), float(y), float(z)
 
 
 def _as_rel_reference(target: str, output_dir: Path, config_dir: Path) -> str:
@@ -19,22 +27,23 @@ def _as_rel_reference(target: str, output_dir: Path, config_dir: Path) -> str:
     if not target_path.is_absolute():
         target_path = (config_dir / target_path).resolve()
     rel_path = os.path.relpath(target_path, output_dir)
-    rel_path = rel_path.replace("\\", "/")
+    if os.sep != "/":
+        rel_path = rel_path.replace(os.sep, "/")
     if not rel_path.startswith("./") and not rel_path.startswith("../"):
         rel_path = f"./{rel_path}"
     return rel_path
 
 
-def _xform_lines(mount: dict[str, Any], indent: str) -> list[str]:
+def _xform_block(mount: dict[str, Any], indent: str) -> str:
     t = _validate_vec3("mount.translate_m", mount.get("translate_m", [0.0, 0.0, 0.0]))
     r = _validate_vec3("mount.rotate_xyz_deg", mount.get("rotate_xyz_deg", [0.0, 0.0, 0.0]))
     s = _validate_vec3("mount.scale", mount.get("scale", [1.0, 1.0, 1.0]))
-    return [
-        f"{indent}double3 xformOp:translate = ({t[0]}, {t[1]}, {t[2]})",
-        f"{indent}double3 xformOp:rotateXYZ = ({r[0]}, {r[1]}, {r[2]})",
-        f"{indent}double3 xformOp:scale = ({s[0]}, {s[1]}, {s[2]})",
-        f'{indent}uniform token[] xformOpOrder = ["xformOp:translate", "xformOp:rotateXYZ", "xformOp:scale"]',
-    ]
+    return (
+        f"{indent}double3 xformOp:translate = ({t[0]}, {t[1]}, {t[2]})\n"
+        f"{indent}double3 xformOp:rotateXYZ = ({r[0]}, {r[1]}, {r[2]})\n"
+        f"{indent}double3 xformOp:scale = ({s[0]}, {s[1]}, {s[2]})\n"
+        f"{indent}{_XFORM_OP_ORDER}\n"
+    )
 
 
 @dataclass(frozen=True)
@@ -57,46 +66,56 @@ def _parent_segments(parent_path: str, root_prim: str) -> list[str]:
     return segments[1:]
 
 
-def _build_children_map(paths: set[tuple[str, ...]]) -> dict[tuple[str, ...], list[str]]:
-    nodes: set[tuple[str, ...]] = {()}
-    for path in paths:
-        for i in range(1, len(path) + 1):
-            nodes.add(path[:i])
-
-    edges: dict[tuple[str, ...], set[str]] = {}
-    for node in nodes:
-        if not node:
-            continue
-        parent = node[:-1]
-        edges.setdefault(parent, set()).add(node[-1])
-
-    return {parent: sorted(children) for parent, children in edges.items()}
+def _register_asset(
+    asset_blocks: dict[tuple[str, ...], str],
+    children_map: dict[tuple[str, ...], set[str]],
+    path: tuple[str, ...],
+    asset: _AssetSpec,
+) -> None:
+    # Render the prim's opening block now (indent follows depth under the root prim), so mount
+    # errors surface before any output is written and emission is plain writes.
+    indent = "    " * len(path)
+    asset_blocks[path] = (
+        f'{indent}def Xform "{path[-1]}" (\n'
+        f"{indent}    prepend references = @{asset.usd_ref}@\n"
+        f"{indent})\n"
+        f"{indent}{{\n"
+    ) + _xform_block(asset.mount, indent + "    ")
+    # Link path into the tree bottom-up; stop at the first edge an earlier asset already added.
+    for depth in range(len(path) - 1, -1, -1):
+        siblings = children_map.setdefault(path[:depth], set())
+        if path[depth] in siblings:
+            break
+        siblings.add(path[depth])
 
 
 def _emit_tree(
-    lines: list[str],
-    children_map: dict[tuple[str, ...], list[str]],
-    assets_by_path: dict[tuple[str, ...], _AssetSpec],
-    node_path: tuple[str, ...],
+    out: TextIO,
+    children_map: dict[tuple[str, ...], set[str]],
+    asset_blocks: dict[tuple[str, ...], str],
     indent: str,
 ) -> None:
-    for child_name in children_map.get(node_path, []):
-        child_path = node_path + (child_name,)
-        asset = assets_by_path.get(child_path)
-        if asset is None:
-            lines.append(f'{indent}over "{child_name}"')
-            lines.append(f"{indent}{{")
-            _emit_tree(lines, children_map, assets_by_path, child_path, indent + "    ")
-            lines.append(f"{indent}}}")
+    # Depth-first with an explicit stack: (path, indent) opens a prim, (None, indent) closes it.
+    stack: list[tuple[tuple[str, ...] | None, str]] = [
+        ((child_name,), indent) for child_name in sorted(children_map.get((), ()), reverse=True)
+    ]
+    while stack:
+        node_path, node_indent = stack.pop()
+        if node_path is None:
+            out.write(f"{node_indent}}}\n")
             continue
 
-        lines.append(f'{indent}def Xform "{child_name}" (')
-        lines.append(f"{indent}    prepend references = @{asset.usd_ref}@")
-        lines.append(f"{indent})")
-        lines.append(f"{indent}{{")
-        lines.extend(_xform_lines(asset.mount, indent + "    "))
-        _emit_tree(lines, children_map, assets_by_path, child_path, indent + "    ")
-        lines.append(f"{indent}}}")
+        block = asset_blocks.get(node_path)
+        if block is None:
+            block = f'{node_indent}over "{node_path[-1]}"\n{node_indent}{{\n'
+        out.write(block)
+
+        stack.append((None, node_indent))
+        child_indent = node_indent + "    "
+        stack.extend(
+            (node_path + (grandchild,), child_indent)
+            for grandchild in sorted(children_map.get(node_path, ()), reverse=True)
+        )
 
 
 def build_assembly(config: dict[str, Any], config_path: Path) -> Path:
@@ -115,79 +134,94 @@ def build_assembly(config: dict[str, Any], config_path: Path) -> Path:
     hand_cfg = config["hand"]
     joints_cfg = config["fixed_joints"]
 
-    arm_ref = _as_rel_reference(str(arm_cfg["usd"]), output_path.parent, config_path.parent)
-    adapter_ref = _as_rel_reference(str(adapter_cfg["usd"]), output_path.parent, config_path.parent)
-    hand_ref = _as_rel_reference(str(hand_cfg["usd"]), output_path.parent, config_path.parent)
+    # Resolve the config directory once; relpath then only has to absolutize the output side.
+    output_dir = output_path.parent
+    config_dir = config_path.parent.resolve()
+    arm_ref = _as_rel_reference(str(arm_cfg["usd"]), output_dir, config_dir)
+    adapter_ref = _as_rel_reference(str(adapter_cfg["usd"]), output_dir, config_dir)
+    hand_ref = _as_rel_reference(str(hand_cfg["usd"]), output_dir, config_dir)
 
     arm_prim = str(arm_cfg.get("prim", "arm"))
     adapter_prim = str(adapter_cfg.get("prim", "adapter"))
     hand_prim = str(hand_cfg.get("prim", "hand"))
 
-    assets_by_path: dict[tuple[str, ...], _AssetSpec] = {
-        (arm_prim,): _AssetSpec(label=arm_prim, usd_ref=arm_ref, mount=arm_cfg.get("mount", {})),
-    }
+    asset_blocks: dict[tuple[str, ...], str] = {}
+    children_map: dict[tuple[str, ...], set[str]] = {}
+    _register_asset(
+        asset_blocks,
+        children_map,
+        (arm_prim,),
+        _AssetSpec(label=arm_prim, usd_ref=arm_ref, mount=arm_cfg.get("mount", {})),
+    )
 
     adapter_parent_segments = _parent_segments(str(adapter_cfg.get("parent", "")), root_prim)
     adapter_path = tuple(adapter_parent_segments + [adapter_prim])
-    assets_by_path[adapter_path] = _AssetSpec(
-        label=adapter_prim,
-        usd_ref=adapter_ref,
-        mount=adapter_cfg.get("mount", {}),
+    _register_asset(
+        asset_blocks,
+        children_map,
+        adapter_path,
+        _AssetSpec(
+            label=adapter_prim,
+            usd_ref=adapter_ref,
+            mount=adapter_cfg.get("mount", {}),
+        ),
     )
 
     hand_parent_segments = _parent_segments(str(hand_cfg.get("parent", "")), root_prim)
     hand_path = tuple(hand_parent_segments + [hand_prim])
-    assets_by_path[hand_path] = _AssetSpec(
-        label=hand_prim,
-        usd_ref=hand_ref,
-        mount=hand_cfg.get("mount", {}),
+    _register_asset(
+        asset_blocks,
+        children_map,
+        hand_path,
+        _AssetSpec(
+            label=hand_prim,
+            usd_ref=hand_ref,
+            mount=hand_cfg.get("mount", {}),
+        ),
     )
 
-    if len(assets_by_path) != 3:
+    if len(asset_blocks) != 3:
         raise ValueError("Duplicate asset path generated; check parent/prim settings in config.")
 
     arm_to_adapter = joints_cfg["arm_to_adapter"]
     adapter_to_hand = joints_cfg["adapter_to_hand"]
 
-    lines: list[str] = [
-        "#usda 1.0",
-        "(",
-        f'    defaultPrim = "{root_prim}"',
-        f'    upAxis = "{up_axis}"',
-        f"    metersPerUnit = {meters_per_unit}",
-        ")",
-        "",
-        f'def Xform "{root_prim}"',
-        "{",
-    ]
-    children_map = _build_children_map(set(assets_by_path.keys()))
-    _emit_tree(
-        lines=lines,
-        children_map=children_map,
-        assets_by_path=assets_by_path,
-        node_path=(),
-        indent="    ",
-    )
-    lines.extend(
-        [
-            "",
-            '    def PhysicsFixedJoint "joint_arm_to_adapter"',
-            "    {",
-            f'        rel physics:body0 = <{arm_to_adapter["body0"]}>',
-            f'        rel physics:body1 = <{arm_to_adapter["body1"]}>',
-            "    }",
-            "",
-            '    def PhysicsFixedJoint "joint_adapter_to_hand"',
-            "    {",
-            f'        rel physics:body0 = <{adapter_to_hand["body0"]}>',
-            f'        rel physics:body1 = <{adapter_to_hand["body1"]}>',
-            "    }",
-            "}",
-            "",
-        ]
-    )
-
-    output_path.write_text("\n".join(lines), encoding="utf-8")
+    # Stream into a sibling temp file and swap it in, so a bad mount or joint entry found
+    # mid-build never leaves a truncated stage in place of the previous one.
+    tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8", buffering=1 << 20) as out:
+            out.write(
+                "#usda 1.0\n"
+                "(\n"
+                f'    defaultPrim = "{root_prim}"\n'
+                f'    upAxis = "{up_axis}"\n'
+                f"    metersPerUnit = {meters_per_unit}\n"
+                ")\n"
+                "\n"
+                f'def Xform "{root_prim}"\n'
+                "{\n"
+            )
+            _emit_tree(out, children_map, asset_blocks, indent="    ")
+            out.write(
+                "\n"
+                '    def PhysicsFixedJoint "joint_arm_to_adapter"\n'
+                "    {\n"
+                f'        rel physics:body0 = <{arm_to_adapter["body0"]}>\n'
+                f'        rel physics:body1 = <{arm_to_adapter["body1"]}>\n'
+                "    }\n"
+                "\n"
+                '    def PhysicsFixedJoint "joint_adapter_to_hand"\n'
+                "    {\n"
+                f'        rel physics:body0 = <{adapter_to_hand["body0"]}>\n'
+                f'        rel physics:body1 = <{adapter_to_hand["body1"]}>\n'
+                "    }\n"
+                "}\n"
+            )
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
     return output_path
 
 
@@ -204,7 +238,8 @@ def main() -> int:
     if not config_path.exists():
         raise FileNotFoundError(f"Config not found: {config_path}")
 
-    config = json.loads(config_path.read_text(encoding="utf-8"))
+    raw_config = config_path.read_bytes()
+    config = orjson.loads(raw_config) if orjson is not None else json.loads(raw_config)
     output_path = build_assembly(config, config_path)
     print(f"Assembly written: {output_path}")
     return 0
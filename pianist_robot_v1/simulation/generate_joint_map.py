@@ -8,6 +8,11 @@ from typing import Any
 import yaml
 from isaaclab.app import AppLauncher
 
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _YamlDumper
+
 
 def _joint_name_from_path(path: str) -> str:
     return path.rsplit("/", 1)[-1]
@@ -44,7 +49,7 @@ def main() -> int:
     simulation_app = app_launcher.app
 
     import omni.usd
-    from pxr import UsdPhysics
+    from pxr import Usd, UsdGeom, UsdPhysics
 
     ctx = omni.usd.get_context()
     opened = ctx.open_stage(str(stage_path))
@@ -56,28 +61,38 @@ def main() -> int:
     hand_joints: list[dict[str, Any]] = []
     articulation_roots: list[str] = []
 
-    for prim in stage.Traverse():
+    # Same prims as stage.Traverse(), except that nothing below a gprim is visited: mesh
+    # children (GeomSubsets) make up much of the keyboard and robot visuals and hold no joints.
+    prim_iter = iter(Usd.PrimRange.Stage(stage))
+    for prim in prim_iter:
         if prim.HasAPI(UsdPhysics.ArticulationRootAPI):
             articulation_roots.append(str(prim.GetPath()))
 
+        if prim.IsA(UsdGeom.Gprim):
+            prim_iter.PruneChildren()
+            continue
         if not prim.IsA(UsdPhysics.RevoluteJoint):
             continue
 
+        # Classify by path before reading any limits: other revolute joints in the scene
+        # (e.g. the keyboard keys) are never written out, so skip their attribute reads.
         path = str(prim.GetPath())
-        joint_name = _joint_name_from_path(path)
-        joint = UsdPhysics.RevoluteJoint(prim)
-        lower = _safe_float(joint.GetLowerLimitAttr().Get(), 0.0)
-        upper = _safe_float(joint.GetUpperLimitAttr().Get(), 0.0)
-        entry = {
-            "name": joint_name,
-            "path": path,
-            "lower_deg": lower,
-            "upper_deg": upper,
-        }
         if "/arm/joints/" in path:
-            arm_joints.append(entry)
+            target = arm_joints
         elif "/hand/joints/" in path:
-            hand_joints.append(entry)
+            target = hand_joints
+        else:
+            continue
+
+        joint = UsdPhysics.RevoluteJoint(prim)
+        target.append(
+            {
+                "name": _joint_name_from_path(path),
+                "path": path,
+                "lower_deg": _safe_float(joint.GetLowerLimitAttr().Get(), 0.0),
+                "upper_deg": _safe_float(joint.GetUpperLimitAttr().Get(), 0.0),
+            }
+        )
 
     if not arm_joints:
         raise RuntimeError("No arm joints found. Check stage path and assembly.")
@@ -138,7 +153,8 @@ def main() -> int:
     }
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(yaml.safe_dump(data, sort_keys=False), encoding="utf-8")
+    with output_path.open("w", encoding="utf-8") as handle:
+        yaml.dump(data, handle, Dumper=_YamlDumper, sort_keys=False)
 
     print(f"Generated joint map: {output_path}")
     print(f"Arm joints discovered: {len(ordered_arm)}")
@@ -1,17 +1,25 @@
 from __future__ import annotations
 
+import functools
 import os
 import sys
+from dataclasses import dataclass
 from pathlib import Path
 
 import numpy as np
 import omni.kit.app
 import omni.usd
 import omni.timeline
-from pxr import Gf
+from pxr import Gf, Sdf, Usd
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the FK kernel runs as plain NumPy without it
+    njit = None
 
 
 DEFAULT_CENTER_DEG = np.array([-12.9, -18.1, -25.5, -15.1, 73.2, -45.0], dtype=np.float32)
+DEFAULT_CENTER_DEG.flags.writeable = False
 ARM_JOINT_PATHS = [
     "/World/PianistRobot/arm/joints/joint1",
     "/World/PianistRobot/arm/joints/joint2",
@@ -44,20 +52,33 @@ NON_ARM_PHYSICS_PREFIXES = [
     "/World/PianistRobot/joint_arm_to_adapter",
     "/World/PianistRobot/joint_adapter_to_hand",
 ]
+# Parse each prim path into an Sdf.Path once instead of on every GetPrimAtPath call.
+ARM_JOINT_SDF_PATHS = [Sdf.Path(path) for path in ARM_JOINT_PATHS]
+ARM_LINK_SDF_PATHS = [Sdf.Path(path) for path in ARM_LINK_PATHS]
+NON_ARM_PHYSICS_SDF_PREFIXES = [Sdf.Path(path) for path in NON_ARM_PHYSICS_PREFIXES]
+NON_ARM_PHYSICS_ATTRS = ("physics:rigidBodyEnabled", "physics:jointEnabled")
+
+
+@dataclass(frozen=True)
+class StartupConfig:
+    center_deg: np.ndarray
+    settle_frames: int
 
 
 def _parse_center_deg() -> np.ndarray:
     raw = os.environ.get("PIANIST_ARM_CENTER_DEG", "")
     if not raw:
-        return DEFAULT_CENTER_DEG.copy()
+        return DEFAULT_CENTER_DEG
     parts = [item.strip() for item in raw.split(",") if item.strip()]
     if len(parts) != 6:
         print(
             f"[WARN] Expected 6 comma-separated arm angles in PIANIST_ARM_CENTER_DEG, got: {raw}",
             flush=True,
         )
-        return DEFAULT_CENTER_DEG.copy()
-    return np.array([float(item) for item in parts], dtype=np.float32)
+        return DEFAULT_CENTER_DEG
+    center_deg = np.array([float(item) for item in parts], dtype=np.float32)
+    center_deg.flags.writeable = False
+    return center_deg
 
 
 def _parse_settle_frames() -> int:
@@ -69,19 +90,26 @@ def _parse_settle_frames() -> int:
         return 120
 
 
-def _disable_non_arm_physics(stage) -> None:
-    for prim in stage.Traverse():
-        path = str(prim.GetPath())
-        if not any(path == prefix or path.startswith(prefix + "/") for prefix in NON_ARM_PHYSICS_PREFIXES):
-            continue
+@functools.lru_cache(maxsize=1)
+def _config() -> StartupConfig:
+    # The environment is read and parsed once; the center pose array is read-only so it can
+    # be shared without defensive copies.
+    return StartupConfig(center_deg=_parse_center_deg(), settle_frames=_parse_settle_frames())
 
-        for attr_name, value in (
-            ("physics:rigidBodyEnabled", False),
-            ("physics:jointEnabled", False),
-        ):
-            attr = prim.GetAttribute(attr_name)
-            if attr.IsValid():
-                attr.Set(value)
+
+def _non_arm_physics_writes(stage) -> list[tuple[Usd.Attribute, bool]]:
+    # Only the prefix subtrees can match, so walk those instead of traversing the whole stage.
+    writes: list[tuple[Usd.Attribute, bool]] = []
+    for prefix in NON_ARM_PHYSICS_SDF_PREFIXES:
+        root = stage.GetPrimAtPath(prefix)
+        if not root.IsValid():
+            continue
+        for prim in Usd.PrimRange(root):
+            for attr_name in NON_ARM_PHYSICS_ATTRS:
+                attr = prim.GetAttribute(attr_name)
+                if attr.IsValid():
+                    writes.append((attr, False))
+    return writes
 
 
 def _rx(angle: float) -> np.ndarray:
@@ -103,70 +131,100 @@ def _rpy_matrix(roll: float, pitch: float, yaw: float) -> np.ndarray:
     return _rz(yaw) @ _ry(pitch) @ _rx(roll)
 
 
-def _axis_angle_matrix(axis: tuple[float, float, float], angle: float) -> np.ndarray:
-    axis_vec = np.array(axis, dtype=np.float64)
-    axis_vec /= np.linalg.norm(axis_vec)
-    x, y, z = axis_vec
-    c, s = np.cos(angle), np.sin(angle)
-    one_minus_c = 1.0 - c
-    return np.array(
-        [
-            [c + x * x * one_minus_c, x * y * one_minus_c - z * s, x * z * one_minus_c + y * s],
-            [y * x * one_minus_c + z * s, c + y * y * one_minus_c, y * z * one_minus_c - x * s],
-            [z * x * one_minus_c - y * s, z * y * one_minus_c + x * s, c + z * z * one_minus_c],
-        ],
-        dtype=np.float64,
-    )
+def _axis_skew(axis: tuple[float, float, float]) -> np.ndarray:
+    x, y, z = np.asarray(axis, dtype=np.float64) / np.linalg.norm(axis)
+    return np.array([[0.0, -z, y], [z, 0.0, -x], [-y, x, 0.0]], dtype=np.float64)
+
+
+# Structure-of-arrays view of ARM_CHAIN: contiguous per-link columns plus a joint mask.
+ARM_CHAIN_XYZ = np.array([xyz for xyz, _, _ in ARM_CHAIN], dtype=np.float64)
+ARM_CHAIN_RPY = np.array([rpy for _, rpy, _ in ARM_CHAIN], dtype=np.float64)
+ARM_REVOLUTE_MASK = np.array([axis is not None for _, _, axis in ARM_CHAIN])
+ARM_REVOLUTE_LINKS = np.flatnonzero(ARM_REVOLUTE_MASK)
+ARM_JOINT_AXES = np.array([axis for _, _, axis in ARM_CHAIN if axis is not None], dtype=np.float64)
+
+# Everything in the chain except the joint angles is constant: build the per-link fixed
+# transforms and the Rodrigues terms (K, K @ K) of each joint axis once at import.
+# They are built in float64 and stored as float32, which is all the viewport pose needs.
+ARM_FIXED_TRANSFORMS = np.tile(np.eye(4, dtype=np.float64), (len(ARM_CHAIN), 1, 1))
+ARM_FIXED_TRANSFORMS[:, :3, :3] = np.stack([_rpy_matrix(*rpy) for rpy in ARM_CHAIN_RPY])
+ARM_FIXED_TRANSFORMS[:, :3, 3] = ARM_CHAIN_XYZ
+ARM_FIXED_TRANSFORMS = ARM_FIXED_TRANSFORMS.astype(np.float32)
+_ARM_AXIS_SKEW = np.stack([_axis_skew(axis) for axis in ARM_JOINT_AXES])
+_ARM_AXIS_SKEW_SQ = (_ARM_AXIS_SKEW @ _ARM_AXIS_SKEW).astype(np.float32)
+_ARM_AXIS_SKEW = _ARM_AXIS_SKEW.astype(np.float32)
+
+
+def _matrix_to_quat(transform: np.ndarray) -> Gf.Quatd:
+    # Gf matrices multiply row vectors, so they hold the transpose of this column-vector chain.
+    return Gf.Matrix4d(*transform.T.ravel().tolist()).ExtractRotationQuat()
+
+
+def _mat4_mul_py(a: np.ndarray, b: np.ndarray, out: np.ndarray) -> None:
+    # Explicit loops so the jitted kernel does not depend on numba's BLAS (scipy) bindings.
+    for i in range(4):
+        for j in range(4):
+            acc = 0.0
+            for k in range(4):
+                acc += a[i, k] * b[k, j]
+            out[i, j] = acc
+
+
+def _chain_transforms_py(
+    joint_rad: np.ndarray,
+    fixed_transforms: np.ndarray,
+    axis_skew: np.ndarray,
+    axis_skew_sq: np.ndarray,
+    revolute_mask: np.ndarray,
+) -> np.ndarray:
+    # World transform of every link: previous @ fixed @ Rodrigues(I + sin*K + (1 - cos)*K^2).
+    # Products go straight into the output slots; only the two 4x4 work buffers are allocated.
+    world = np.empty_like(fixed_transforms)
+    scratch = np.zeros_like(fixed_transforms[0])
+    revolute = np.zeros_like(fixed_transforms[0])
+    for i in range(4):
+        scratch[i, i] = 1.0
+        revolute[i, i] = 1.0
+    previous = scratch.copy()
+    joint = 0
+    for link in range(fixed_transforms.shape[0]):
+        if revolute_mask[link]:
+            sin = np.sin(joint_rad[joint])
+            one_minus_cos = 1.0 - np.cos(joint_rad[joint])
+            for i in range(3):
+                for j in range(3):
+                    revolute[i, j] = sin * axis_skew[joint, i, j] + one_minus_cos * axis_skew_sq[joint, i, j]
+                revolute[i, i] += 1.0
+            _mat4_mul(previous, fixed_transforms[link], scratch)
+            _mat4_mul(scratch, revolute, world[link])
+            joint += 1
+        else:
+            _mat4_mul(previous, fixed_transforms[link], world[link])
+        previous = world[link]
+    return world
+
+
+# _chain_transforms looks _mat4_mul up at call (or numba compile) time. Without numba the loop
+# kernel would only be slow Python, so plain NumPy matmul stands in for it.
+if njit is None:
+    _mat4_mul = np.matmul
+    _chain_transforms = _chain_transforms_py
+else:
+    _mat4_mul = njit(cache=True, fastmath=True)(_mat4_mul_py)
+    _chain_transforms = njit(cache=True, fastmath=True)(_chain_transforms_py)
 
 
-def _matrix_to_quat(rotation: np.ndarray) -> Gf.Quatd:
-    trace = float(rotation[0, 0] + rotation[1, 1] + rotation[2, 2])
-    if trace > 0.0:
-        s = 0.5 / np.sqrt(trace + 1.0)
-        w = 0.25 / s
-        x = (rotation[2, 1] - rotation[1, 2]) * s
-        y = (rotation[0, 2] - rotation[2, 0]) * s
-        z = (rotation[1, 0] - rotation[0, 1]) * s
-    elif rotation[0, 0] > rotation[1, 1] and rotation[0, 0] > rotation[2, 2]:
-        s = 2.0 * np.sqrt(1.0 + rotation[0, 0] - rotation[1, 1] - rotation[2, 2])
-        w = (rotation[2, 1] - rotation[1, 2]) / s
-        x = 0.25 * s
-        y = (rotation[0, 1] + rotation[1, 0]) / s
-        z = (rotation[0, 2] + rotation[2, 0]) / s
-    elif rotation[1, 1] > rotation[2, 2]:
-        s = 2.0 * np.sqrt(1.0 + rotation[1, 1] - rotation[0, 0] - rotation[2, 2])
-        w = (rotation[0, 2] - rotation[2, 0]) / s
-        x = (rotation[0, 1] + rotation[1, 0]) / s
-        y = 0.25 * s
-        z = (rotation[1, 2] + rotation[2, 1]) / s
-    else:
-        s = 2.0 * np.sqrt(1.0 + rotation[2, 2] - rotation[0, 0] - rotation[1, 1])
-        w = (rotation[1, 0] - rotation[0, 1]) / s
-        x = (rotation[0, 2] + rotation[2, 0]) / s
-        y = (rotation[1, 2] + rotation[2, 1]) / s
-        z = 0.25 * s
-    return Gf.Quatd(float(w), Gf.Vec3d(float(x), float(y), float(z)))
+def _compute_arm_link_poses(center_deg: np.ndarray) -> list[tuple[np.ndarray, Gf.Quatf]]:
+    joint_rad = np.deg2rad(center_deg.astype(np.float32, copy=False))[ARM_REVOLUTE_LINKS]
+    world = _chain_transforms(
+        joint_rad, ARM_FIXED_TRANSFORMS, _ARM_AXIS_SKEW, _ARM_AXIS_SKEW_SQ, ARM_REVOLUTE_MASK
+    )
+    return [(transform[:3, 3].copy(), _matrix_to_quat(transform)) for transform in world]
 
 
-def _compute_arm_link_poses(center_deg: np.ndarray) -> list[tuple[np.ndarray, Gf.Quatf]]:
-    joint_rad = np.deg2rad(center_deg.astype(np.float64))
-    transforms: list[tuple[np.ndarray, Gf.Quatf]] = []
-    current = np.eye(4, dtype=np.float64)
-    for joint_idx, (xyz, rpy, axis) in enumerate(ARM_CHAIN):
-        fixed = np.eye(4, dtype=np.float64)
-        fixed[:3, :3] = _rpy_matrix(*rpy)
-        fixed[:3, 3] = np.array(xyz, dtype=np.float64)
-        current = current @ fixed
-        if axis is not None:
-            revolute = np.eye(4, dtype=np.float64)
-            revolute[:3, :3] = _axis_angle_matrix(axis, joint_rad[joint_idx])
-            current = current @ revolute
-        transforms.append((current[:3, 3].copy(), _matrix_to_quat(current[:3, :3])))
-    return transforms
-
-
-def _apply_arm_link_poses(stage, center_deg: np.ndarray) -> None:
-    for link_path, (translation, orientation) in zip(ARM_LINK_PATHS, _compute_arm_link_poses(center_deg)):
+def _arm_link_pose_writes(stage, center_deg: np.ndarray) -> list[tuple[Usd.Attribute, object]]:
+    writes: list[tuple[Usd.Attribute, object]] = []
+    for link_path, (translation, orientation) in zip(ARM_LINK_SDF_PATHS, _compute_arm_link_poses(center_deg)):
         prim = stage.GetPrimAtPath(link_path)
         if not prim.IsValid():
             print(f"[WARN] Missing arm link prim: {link_path}", flush=True)
@@ -174,9 +232,53 @@ def _apply_arm_link_poses(stage, center_deg: np.ndarray) -> None:
         translate_attr = prim.GetAttribute("xformOp:translate")
         orient_attr = prim.GetAttribute("xformOp:orient")
         if translate_attr.IsValid():
-            translate_attr.Set(Gf.Vec3d(*[float(v) for v in translation]))
+            writes.append((translate_attr, Gf.Vec3d(*translation.tolist())))
         if orient_attr.IsValid():
-            orient_attr.Set(orientation)
+            writes.append((orient_attr, orientation))
+    return writes
+
+
+def _arm_joint_state_writes(stage, center_deg: np.ndarray) -> list[tuple[Usd.Attribute, float]]:
+    writes: list[tuple[Usd.Attribute, float]] = []
+    for joint_path, target_deg in zip(ARM_JOINT_SDF_PATHS, center_deg.tolist()):
+        prim = stage.GetPrimAtPath(joint_path)
+        if not prim.IsValid():
+            print(f"[WARN] Missing joint prim: {joint_path}", flush=True)
+            continue
+
+        # Author the drive target and initial state, then let physics settle briefly so
+        # the articulated link transforms in the viewport match the requested pose.
+        for attr_name, value in (
+            ("drive:angular:physics:targetPosition", target_deg),
+            ("drive:angular:physics:targetVelocity", 0.0),
+            ("state:angular:physics:position", target_deg),
+            ("state:angular:physics:velocity", 0.0),
+        ):
+            attr = prim.GetAttribute(attr_name)
+            if attr.IsValid():
+                writes.append((attr, value))
+    return writes
+
+
+def _split_writes_by_spec(
+    stage, writes: list[tuple[Usd.Attribute, object]]
+) -> tuple[list[tuple[Sdf.AttributeSpec, object]], list[tuple[Usd.Attribute, object]]]:
+    # Attributes that already have a spec in the edit target layer can be written through Sdf
+    # inside a ChangeBlock. The rest need a Usd Set to author an override spec first, and Usd
+    # calls are not safe inside a ChangeBlock. Sdf does not convert values (e.g. Quatd to a
+    # quatf spec) the way Usd Set does, so cast to the spec's value type here.
+    edit_target = stage.GetEditTarget()
+    layer = edit_target.GetLayer()
+    spec_writes: list[tuple[Sdf.AttributeSpec, object]] = []
+    usd_writes: list[tuple[Usd.Attribute, object]] = []
+    for attr, value in writes:
+        spec = layer.GetAttributeAtPath(edit_target.MapToSpecPath(attr.GetPath()))
+        if spec:
+            value_class = spec.typeName.type.pythonClass
+            spec_writes.append((spec, value if value_class is None else value_class(value)))
+        else:
+            usd_writes.append((attr, value))
+    return spec_writes, usd_writes
 
 
 def main() -> None:
@@ -191,37 +293,33 @@ def main() -> None:
     if not opened:
         return
 
-    center_deg = _parse_center_deg()
+    config = _config()
+    center_deg = config.center_deg
     stage = omni.usd.get_context().get_stage()
     if stage is None:
         print("[WARN] No stage available after open.", flush=True)
         return
 
-    _disable_non_arm_physics(stage)
-    _apply_arm_link_poses(stage, center_deg)
-
-    for joint_path, target_deg in zip(ARM_JOINT_PATHS, center_deg):
-        prim = stage.GetPrimAtPath(joint_path)
-        if not prim.IsValid():
-            print(f"[WARN] Missing joint prim: {joint_path}", flush=True)
-            continue
-
-        # Author the drive target and initial state, then let physics settle briefly so
-        # the articulated link transforms in the viewport match the requested pose.
-        for attr_name, value in (
-            ("drive:angular:physics:targetPosition", float(target_deg)),
-            ("drive:angular:physics:targetVelocity", 0.0),
-            ("state:angular:physics:position", float(target_deg)),
-            ("state:angular:physics:velocity", 0.0),
-        ):
-            attr = prim.GetAttribute(attr_name)
-            if attr.IsValid():
-                attr.Set(value)
+    # Resolve every target attribute up front. Values whose spec is missing from the edit
+    # target are authored through Usd first; the rest go out as one batch of Sdf spec writes.
+    writes = (
+        _non_arm_physics_writes(stage)
+        + _arm_link_pose_writes(stage, center_deg)
+        + _arm_joint_state_writes(stage, center_deg)
+    )
+    spec_writes, usd_writes = _split_writes_by_spec(stage, writes)
+    for attr, value in usd_writes:
+        attr.Set(value)
+    with Sdf.ChangeBlock():
+        for spec, value in spec_writes:
+            spec.default = value
 
     timeline = omni.timeline.get_timeline_interface()
     timeline.play()
     app = omni.kit.app.get_app()
-    settle_frames = _parse_settle_frames()
+    # Fixed frame count: PhysX does not write link poses back to USD by default, so there is
+    # no cheap stage-side signal for when the arm has settled.
+    settle_frames = config.settle_frames
     for _ in range(settle_frames):
         app.update()
     timeline.pause()
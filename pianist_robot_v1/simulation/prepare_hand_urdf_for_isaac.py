@@ -56,6 +56,42 @@ def _bake_glb_visual_to_obj(glb_path: Path, baked_mesh_dir: Path) -> Optional[Pa
     return out_path.resolve()
 
 
+def _replacement_filename(
+    filename: str,
+    input_dir: Path,
+    absolute_paths: bool,
+    baked_mesh_dir: Path,
+    prefer_collision_visuals: bool,
+    bake_glb_visuals: bool,
+) -> str:
+    resolved = _resolve_mesh_path(input_dir, filename)
+    replacement = resolved
+
+    # For this hand model, Isaac imports collision OBJ meshes more reliably
+    # than GLB visuals for link-local alignment and hierarchy.
+    if filename.endswith(".glb") and "meshes/visual/" in filename:
+        collision_path = _collision_mesh_for_visual(resolved)
+        collision_exists = collision_path.exists()
+        if prefer_collision_visuals and collision_exists:
+            replacement = collision_path
+        elif bake_glb_visuals:
+            baked = _bake_glb_visual_to_obj(resolved, baked_mesh_dir)
+            if baked is not None:
+                replacement = baked
+            elif collision_exists:
+                replacement = collision_path
+        elif collision_exists:
+            replacement = collision_path
+
+    replacement = replacement.resolve()
+    if not absolute_paths:
+        try:
+            return str(replacement.relative_to(input_dir))
+        except ValueError:
+            pass
+    return _to_urdf_mesh_filename(replacement)
+
+
 def prepare_urdf(
     input_urdf: Path,
     output_urdf: Path,
@@ -70,39 +106,25 @@ def prepare_urdf(
     tree = ET.parse(input_urdf)
     root = tree.getroot()
 
+    # Links often share a mesh file; resolve, stat and bake each distinct filename once.
+    replacements: dict[str, str] = {}
     for mesh in root.findall(".//visual/geometry/mesh"):
         filename = mesh.get("filename")
         if not filename:
             continue
 
-        resolved = _resolve_mesh_path(input_dir, filename)
-        replacement = resolved
-
-        # For this hand model, Isaac imports collision OBJ meshes more reliably
-        # than GLB visuals for link-local alignment and hierarchy.
-        if "meshes/visual/" in filename and filename.endswith(".glb"):
-            collision_path = _collision_mesh_for_visual(resolved)
-            if prefer_collision_visuals and collision_path.exists():
-                replacement = collision_path.resolve()
-            elif bake_glb_visuals:
-                baked = _bake_glb_visual_to_obj(resolved, baked_mesh_dir)
-                if baked is not None:
-                    replacement = baked
-                elif collision_path.exists():
-                    replacement = collision_path.resolve()
-            elif collision_path.exists():
-                replacement = collision_path.resolve()
-
-        if absolute_paths:
-            mesh.set("filename", _to_urdf_mesh_filename(replacement.resolve()))
-        else:
-            try:
-                mesh.set(
-                    "filename",
-                    str(replacement.resolve().relative_to(input_dir.resolve())),
-                )
-            except ValueError:
-                mesh.set("filename", _to_urdf_mesh_filename(replacement.resolve()))
+        replacement = replacements.get(filename)
+        if replacement is None:
+            replacement = _replacement_filename(
+                filename,
+                input_dir,
+                absolute_paths,
+                baked_mesh_dir,
+                prefer_collision_visuals,
+                bake_glb_visuals,
+            )
+            replacements[filename] = replacement
+        mesh.set("filename", replacement)
 
     output_urdf.parent.mkdir(parents=True, exist_ok=True)
     tree.write(output_urdf, encoding="utf-8", xml_declaration=True)
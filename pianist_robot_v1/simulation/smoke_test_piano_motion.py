@@ -5,22 +5,24 @@ import os
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import yaml
 from isaaclab.app import AppLauncher
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
 
-def _set_joint_target_deg(stage: Any, joint_path: str, target_deg: float) -> None:
+
+def _joint_target_attr(stage: Any, joint_path: str) -> Any:
     prim = stage.GetPrimAtPath(joint_path)
     if not prim.IsValid():
         raise RuntimeError(f"Joint path not found: {joint_path}")
     attr = prim.GetAttribute("drive:angular:physics:targetPosition")
     if not attr.IsValid():
         raise RuntimeError(f"Joint has no drive targetPosition attribute: {joint_path}")
-    attr.Set(float(target_deg))
-
-
-def _interp(open_deg: float, close_deg: float, fraction: float) -> float:
-    return open_deg + (close_deg - open_deg) * fraction
+    return attr
 
 
 def main() -> int:
@@ -56,7 +58,8 @@ def main() -> int:
 
     if not joint_map_path.exists():
         raise FileNotFoundError(f"Joint map not found: {joint_map_path}")
-    config = yaml.safe_load(joint_map_path.read_text(encoding="utf-8"))
+    with joint_map_path.open("rb") as handle:
+        config = yaml.load(handle, Loader=_YamlLoader)
 
     app_launcher = AppLauncher(args)
     simulation_app = app_launcher.app
@@ -73,9 +76,14 @@ def main() -> int:
     timeline = omni.timeline.get_timeline_interface()
     timeline.play()
 
+    # SimulationApp has no multi-frame update, so keep the per-frame loop as lean as possible.
+    update = simulation_app.update
+
     def step_frames(count: int) -> None:
-        for _ in range(max(0, count)):
-            simulation_app.update()
+        if count <= 0:
+            return
+        for _ in range(count):
+            update()
 
     arm_order = config["arm"]["joint_order"]
     play_center = config["arm"]["play_center_deg"]
@@ -89,21 +97,41 @@ def main() -> int:
     )
     press_fraction = max(0.0, min(1.0, press_fraction))
 
+    # Resolve every drive target attribute once (this also validates the whole joint map up
+    # front); the loops below only call Set().
+    arm_paths = [arm_joints_cfg[joint_name]["path"] for joint_name in arm_order]
+    target_attrs = {
+        joint_path: _joint_target_attr(stage, joint_path)
+        for joint_path in arm_paths + [p for f in hand_fingers.values() for p in f["joint_paths"]]
+    }
+
+    def set_targets(joint_paths: list[str], targets_deg: list[float]) -> None:
+        for joint_path, target in zip(joint_paths, targets_deg):
+            target_attrs[joint_path].Set(float(target))
+
+    def open_hand() -> None:
+        for finger_cfg in hand_fingers.values():
+            set_targets(finger_cfg["joint_paths"], finger_cfg["open_deg"])
+
+    # press_fraction is fixed for the run, so each finger's press pose is too; interpolate
+    # all of a finger's joints in one array op and keep the result as plain floats.
+    press_positions = {}
+    for finger_name in play_finger_order:
+        open_deg = np.asarray(hand_fingers[finger_name]["open_deg"], dtype=np.float64)
+        closed_deg = np.asarray(hand_fingers[finger_name]["closed_deg"], dtype=np.float64)
+        press_positions[finger_name] = (open_deg + (closed_deg - open_deg) * press_fraction).tolist()
+
     print(f"Loaded stage: {stage_path}", flush=True)
     print(f"Using joint map: {joint_map_path}", flush=True)
     print(f"Loops: {args.loops}, press_fraction: {press_fraction:.2f}", flush=True)
 
     # 1) Move arm to play-center pose.
-    for idx, joint_name in enumerate(arm_order):
-        joint_path = arm_joints_cfg[joint_name]["path"]
-        _set_joint_target_deg(stage, joint_path, play_center[idx])
+    set_targets(arm_paths, play_center)
     print(f"Arm moved to play center: {play_center}", flush=True)
     step_frames(args.settle_frames)
 
     # 2) Ensure hand starts fully open (all fingers, including thumb).
-    for finger_cfg in hand_fingers.values():
-        for joint_path, open_deg in zip(finger_cfg["joint_paths"], finger_cfg["open_deg"]):
-            _set_joint_target_deg(stage, joint_path, open_deg)
+    open_hand()
     print("Hand set to fully open.", flush=True)
     step_frames(args.release_frames)
 
@@ -113,24 +141,15 @@ def main() -> int:
         for finger_name in play_finger_order:
             finger_cfg = hand_fingers[finger_name]
             joint_paths = finger_cfg["joint_paths"]
-            open_positions = finger_cfg["open_deg"]
-            closed_positions = finger_cfg["closed_deg"]
-            press_positions = [
-                _interp(o, c, press_fraction) for o, c in zip(open_positions, closed_positions)
-            ]
-
-            for joint_path, target in zip(joint_paths, press_positions):
-                _set_joint_target_deg(stage, joint_path, target)
+
+            set_targets(joint_paths, press_positions[finger_name])
             step_frames(args.press_frames)
 
-            for joint_path, target in zip(joint_paths, open_positions):
-                _set_joint_target_deg(stage, joint_path, target)
+            set_targets(joint_paths, finger_cfg["open_deg"])
             step_frames(args.release_frames)
 
     # End with fully open hand for repeatability.
-    for finger_cfg in hand_fingers.values():
-        for joint_path, open_deg in zip(finger_cfg["joint_paths"], finger_cfg["open_deg"]):
-            _set_joint_target_deg(stage, joint_path, open_deg)
+    open_hand()
     step_frames(args.release_frames)
 
     print("Smoke test complete.", flush=True)
@@ -2,63 +2,24 @@ from __future__ import annotations
 
 import argparse
 import logging
-import os
 import sys
 from typing import Sequence
 
-from check_hardware import DEFAULT_KEYWORDS, find_rs485_ports, ping_host
-DEFAULT_XARM_IP = "192.168.0.203"
-DEFAULT_HAND_PORT = "/dev/ttyUSB0"
+from check_hardware import DEFAULT_KEYWORDS, find_rs485_ports_cached
+from drivers import InspireHandConfig, InspireHandDriver, XArmConfig, XArmDriver
+from practice_common import (
+    DEFAULT_HAND_PORT,
+    DEFAULT_XARM_IP,
+    configure_logging,
+    parse_joint_targets,
+    resolve_hand_port,
+    run_precheck,
+)
+
 DEFAULT_ARM_HOME_JOINTS_DEG = (0.0, 0.0, 0.0, 0.0, 90.0, -45.0)
 DEFAULT_ARM_TEST_JOINTS_DEG = (0.0, 0.0, -15.0, 0.0, 110.0, -45.0)
 
 
-def configure_logging() -> None:
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-    )
-
-
-def _parse_joint_targets(text: str) -> list[float]:
-    parts = [p.strip() for p in text.split(",") if p.strip()]
-    if len(parts) != 6:
-        raise ValueError(f"Expected 6 comma-separated joint values, got {len(parts)}")
-    return [float(p) for p in parts]
-
-
-def _resolve_hand_port(requested_port: str) -> str:
-    if requested_port != "auto":
-        return requested_port
-
-    matches, usb_ports = find_rs485_ports(DEFAULT_KEYWORDS)
-    if matches:
-        return matches[0].device
-    if usb_ports:
-        return usb_ports[0].device
-    return DEFAULT_HAND_PORT
-
-
-def _run_precheck(xarm_ip: str, hand_port: str, logger: logging.Logger) -> bool:
-    matches, _ = find_rs485_ports(DEFAULT_KEYWORDS)
-    ping_ok, ping_output = ping_host(xarm_ip, timeout_seconds=1, count=2)
-
-    device_present = any(getattr(port, "device", "") == hand_port for port in matches) or os.path.exists(hand_port)
-    device_access = os.access(hand_port, os.R_OK | os.W_OK) if os.path.exists(hand_port) else False
-    hand_ok = device_present and device_access
-
-    logger.info("Precheck xArm ping: %s", "PASS" if ping_ok else "FAIL")
-    logger.info("Precheck hand port: %s (%s)", hand_port, "PASS" if hand_ok else "FAIL")
-    if not ping_ok:
-        logger.warning("xArm ping output: %s", ping_output.replace("\n", " | "))
-    if device_present and not device_access:
-        logger.warning(
-            "Hand serial device exists but current user lacks read/write permissions: %s",
-            hand_port,
-        )
-    return ping_ok and hand_ok
-
-
 def run_startup_test(
     xarm_ip: str,
     hand_port: str,
@@ -71,8 +32,6 @@ def run_startup_test(
     hand_close_value: int,
     hand_hold_seconds: float,
 ) -> bool:
-    from drivers import InspireHandConfig, InspireHandDriver, XArmConfig, XArmDriver
-
     logger = logging.getLogger("startup_test")
     arm = XArmDriver(XArmConfig(robot_ip=xarm_ip, speed=arm_speed, acceleration=arm_acceleration))
     hand = InspireHandDriver(InspireHandConfig(port=hand_port, slave_id=hand_slave_id))
@@ -87,7 +46,7 @@ def run_startup_test(
             logger.error("xArm connection failed.")
             return False
 
-        logger.info("Moving xArm to default home pose first: %s", list(arm_home_joint_targets))
+        logger.info("Moving xArm to default home pose first: %s", arm_home_joint_targets)
         if not arm.move_joints(arm_home_joint_targets, speed=arm_speed, acceleration=arm_acceleration, wait=True):
             logger.error("xArm failed to reach default home pose.")
             return False
@@ -103,7 +62,7 @@ def run_startup_test(
             logger.error("Failed to command initial full-hand open.")
             return False
 
-        logger.info("Moving xArm to startup test pose: %s", list(arm_test_joint_targets))
+        logger.info("Moving xArm to startup test pose: %s", arm_test_joint_targets)
         if not arm.move_joints(arm_test_joint_targets, speed=arm_speed, acceleration=arm_acceleration, wait=True):
             logger.error("xArm failed to reach startup test pose.")
             return False
@@ -122,7 +81,7 @@ def run_startup_test(
             logger.error("Failed to command full hand open.")
             return False
 
-        logger.info("Returning xArm to default home pose: %s", list(arm_home_joint_targets))
+        logger.info("Returning xArm to default home pose: %s", arm_home_joint_targets)
         if not arm.move_joints(arm_home_joint_targets, speed=arm_speed, acceleration=arm_acceleration, wait=True):
             logger.error("xArm failed to return to default home pose.")
             return False
@@ -132,7 +91,7 @@ def run_startup_test(
         return True
     finally:
         if arm_ok and not arm_home_reached:
-            logger.warning("Attempting safe return to home pose: %s", list(arm_home_joint_targets))
+            logger.warning("Attempting safe return to home pose: %s", arm_home_joint_targets)
             arm.move_joints(arm_home_joint_targets, speed=arm_speed, acceleration=arm_acceleration, wait=True)
         if hand_ok:
             hand.disconnect()
@@ -182,18 +141,19 @@ def main() -> int:
     logger = logging.getLogger("startup_test")
 
     try:
-        arm_test_targets = _parse_joint_targets(args.test_arm_joints)
-        arm_home_targets = _parse_joint_targets(args.home_arm_joints)
+        arm_test_targets = parse_joint_targets(args.test_arm_joints)
+        arm_home_targets = parse_joint_targets(args.home_arm_joints)
     except ValueError as exc:
         logger.error("%s", exc)
         return 2
 
-    hand_port = _resolve_hand_port(args.hand_port)
+    rs485_scan = find_rs485_ports_cached(DEFAULT_KEYWORDS)
+    hand_port = resolve_hand_port(args.hand_port, rs485_scan)
     logger.info("Resolved hand port: %s", hand_port)
 
     precheck_ok = True
     if not args.skip_precheck:
-        precheck_ok = _run_precheck(args.xarm_ip, hand_port, logger)
+        precheck_ok = run_precheck(args.xarm_ip, hand_port, rs485_scan[0], logger)
         if not precheck_ok and not args.force:
             logger.error("Precheck failed. Aborting startup routine.")
             logger.error("Use --force to run anyway, or fix connectivity and retry.")
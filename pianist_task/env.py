@@ -9,7 +9,7 @@ import isaaclab.sim as sim_utils
 from isaaclab.assets import Articulation
 from isaaclab.envs import DirectRLEnv
 from isaaclab.sim.spawners.from_files import GroundPlaneCfg, spawn_from_usd, spawn_ground_plane
-from isaaclab.utils.math import combine_frame_transforms, quat_from_euler_xyz
+from isaaclab.utils.math import quat_from_euler_xyz
 
 from mdp import curriculums as pianist_curriculums
 from pianist_env_cfg import (
@@ -28,13 +28,57 @@ KEYBOARD_ROT_QUAT = torch.tensor(KEYBOARD_ROT_QUAT_WXYZ, dtype=torch.float32)
 C4_LOCAL_POSITION = torch.tensor([0.0, 0.05875, 0.02250], dtype=torch.float32)
 
 
+@torch.jit.script
+def _clamped_targets(
+    center: torch.Tensor, scale: float, actions: torch.Tensor, lower: torch.Tensor, upper: torch.Tensor
+) -> torch.Tensor:
+    return torch.clamp(center + scale * actions, lower, upper)
+
+
+@torch.jit.script
+def _hand_root_pose(
+    eef_pose: torch.Tensor, mount_pos_b: torch.Tensor, mount_quat_b: torch.Tensor, out: torch.Tensor
+) -> torch.Tensor:
+    # combine_frame_transforms(eef_pos, eef_quat, mount_pos, mount_quat) written into out as (N, 7)
+    # pos + wxyz quat; the mount may be a single (1, 3)/(1, 4) transform broadcast over all envs.
+    eef_pos = eef_pose[:, :3]
+    w1, x1, y1, z1 = eef_pose[:, 3], eef_pose[:, 4], eef_pose[:, 5], eef_pose[:, 6]
+    w2, x2, y2, z2 = mount_quat_b[:, 0], mount_quat_b[:, 1], mount_quat_b[:, 2], mount_quat_b[:, 3]
+    eef_xyz = eef_pose[:, 4:7]
+    t = 2.0 * torch.cross(eef_xyz, mount_pos_b, dim=-1)
+    out[:, :3] = eef_pos + mount_pos_b + w1.unsqueeze(-1) * t + torch.cross(eef_xyz, t, dim=-1)
+    out[:, 3] = w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2
+    out[:, 4] = w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2
+    out[:, 5] = w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2
+    out[:, 6] = w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2
+    return out
+
+
+@torch.jit.script
+def _step_reward(
+    tip_positions: torch.Tensor, target_pos: torch.Tensor, discipline_joint_pos: torch.Tensor
+) -> torch.Tensor:
+    # alignment: nearest tip by squared distance, so only the winner pays for the sqrt
+    diff = tip_positions - target_pos.unsqueeze(1)
+    alignment_reward = 1.0 / (1.0 + torch.sqrt((diff * diff).sum(dim=-1).amin(dim=1)))
+    discipline_penalty = torch.linalg.vector_norm(discipline_joint_pos, dim=1)
+    # press depth (target z - tip z) is just -diff z, already computed above
+    diff_z = diff[:, :, 2]
+    force_reward = ((diff_z < 0.0) & (diff_z > -0.010)).sum(dim=1, dtype=torch.float32)
+    return 20.0 * alignment_reward - 15.0 * discipline_penalty + 5.0 * force_reward
+
+
 class PianistRLEnv(DirectRLEnv):
     cfg: PianistEnvCfg
 
     def __init__(self, cfg: PianistEnvCfg, render_mode: str | None = None, **kwargs):
-        self.current_midi_goal = torch.zeros((cfg.scene.num_envs, len(cfg.midi_notes)), device=cfg.sim.device)
-        self.current_target_pos = torch.zeros((cfg.scene.num_envs, 3), device=cfg.sim.device)
+        # Per-env goal state: contiguous float32 (SoA) on the sim device, read every step by rewards/obs.
+        self.current_midi_goal = torch.zeros(
+            (cfg.scene.num_envs, len(cfg.midi_notes)), device=cfg.sim.device, dtype=torch.float32
+        )
+        self.current_target_pos = torch.zeros((cfg.scene.num_envs, 3), device=cfg.sim.device, dtype=torch.float32)
         self.current_note_indices = torch.zeros((cfg.scene.num_envs,), device=cfg.sim.device, dtype=torch.long)
+        self._curriculum_idx_scratch = torch.empty((cfg.scene.num_envs,), device=cfg.sim.device, dtype=torch.long)
         self._keyboard_translation = KEYBOARD_TRANSLATION.to(cfg.sim.device)
         self._keyboard_rot_quat = KEYBOARD_ROT_QUAT.to(cfg.sim.device)
         super().__init__(cfg, render_mode, **kwargs)
@@ -50,22 +94,45 @@ class PianistRLEnv(DirectRLEnv):
         )
         self._pinky_joint_ids, _ = self.hand.find_joints(["pinky_proximal_joint"], preserve_order=True)
         self._tip_body_ids, _ = self.hand.find_bodies(["index_tip", "middle_tip", "ring_tip"], preserve_order=True)
+        # Long-tensor copies of the id lists for the per-step index_select gathers.
+        self._arm_joint_index = torch.as_tensor(self._arm_joint_ids, device=self.device, dtype=torch.long)
+        self._finger_joint_index = torch.as_tensor(self._finger_joint_ids, device=self.device, dtype=torch.long)
+        self._tip_body_index = torch.as_tensor(self._tip_body_ids, device=self.device, dtype=torch.long)
+        self._discipline_ids = torch.as_tensor(
+            self._thumb_joint_ids + self._pinky_joint_ids, device=self.device, dtype=torch.long
+        )
 
         self._arm_center_joint_pos = self.arm.data.default_joint_pos.clone()
         self._arm_center_joint_pos[:, self._arm_joint_ids] = ARM_CENTER_RAD.to(self.device)
         self._arm_joint_vel_zeros = torch.zeros_like(self.arm.data.default_joint_vel)
 
+        # Joint limits do not change during training: slice the driven joints' bounds once.
+        arm_limits = self.arm.data.soft_joint_pos_limits[:, self._arm_joint_ids]
+        self._arm_limits_lower = arm_limits[..., 0].contiguous()
+        self._arm_limits_upper = arm_limits[..., 1].contiguous()
+        finger_limits = self.hand.data.soft_joint_pos_limits[:, self._finger_joint_ids]
+        self._finger_limits_lower = finger_limits[..., 0].contiguous()
+        self._finger_limits_upper = finger_limits[..., 1].contiguous()
+
         self._hand_joint_center = self.hand.data.default_joint_pos.clone()
         self._hand_joint_vel_zeros = torch.zeros_like(self.hand.data.default_joint_vel)
+        # The action offsets are applied around fixed centers, so gather those columns once too.
+        self._arm_center_targets = self._arm_center_joint_pos.index_select(1, self._arm_joint_index)
+        self._finger_center_targets = self._hand_joint_center.index_select(1, self._finger_joint_index)
         self._hand_root_velocity_zeros = torch.zeros((self.num_envs, 6), device=self.device, dtype=torch.float32)
-        self._mount_pos_b = HAND_MOUNT_POS_B.to(self.device).repeat(self.num_envs, 1)
-
-        roll = torch.full((self.num_envs,), math.radians(HAND_MOUNT_ROTATE_XYZ_DEG[0]), device=self.device)
-        pitch = torch.full((self.num_envs,), math.radians(HAND_MOUNT_ROTATE_XYZ_DEG[1]), device=self.device)
-        yaw = torch.full((self.num_envs,), math.radians(HAND_MOUNT_ROTATE_XYZ_DEG[2]), device=self.device)
-        self._mount_quat_b = quat_from_euler_xyz(roll, pitch, yaw)
-
-        self.base_c4_pos = self.scene.env_origins + self._keyboard_translation + C4_LOCAL_POSITION.to(self.device)
+        # write_root_pose_to_sim copies its input, so one (N, 7) scratch buffer serves every step and reset.
+        self._hand_root_pose_buf = torch.empty((self.num_envs, 7), device=self.device, dtype=torch.float32)
+        self._thumb_tucked_targets = torch.zeros((self.num_envs, len(self._thumb_joint_ids)), device=self.device)
+        self._pinky_tucked_targets = torch.zeros((self.num_envs, len(self._pinky_joint_ids)), device=self.device)
+        # The hand mount is the same for every env: keep (1, 3)/(1, 4) constants and let
+        # _hand_root_pose broadcast them over the batch.
+        self._mount_pos_b = HAND_MOUNT_POS_B.to(self.device).unsqueeze(0)
+        mount_rpy = torch.tensor([math.radians(v) for v in HAND_MOUNT_ROTATE_XYZ_DEG], device=self.device)
+        self._mount_quat_b = quat_from_euler_xyz(mount_rpy[0:1], mount_rpy[1:2], mount_rpy[2:3])
+
+        self.base_c4_pos = (
+            self.scene.env_origins + self._keyboard_translation + C4_LOCAL_POSITION.to(self.device)
+        ).to(dtype=torch.float32).contiguous()
 
         self.actions = torch.zeros((self.num_envs, self.cfg.action_space), device=self.device, dtype=torch.float32)
         all_env_ids = torch.arange(self.num_envs, device=self.device, dtype=torch.long)
@@ -95,55 +162,54 @@ class PianistRLEnv(DirectRLEnv):
         light_cfg.func("/World/light", light_cfg)
 
     def _pre_physics_step(self, actions: torch.Tensor) -> None:
-        self.actions = actions.clone().clamp_(-1.0, 1.0)
+        # self.actions is allocated once in __init__; refill it in place every step.
+        self.actions.copy_(actions).clamp_(-1.0, 1.0)
 
     def _apply_action(self) -> None:
-        arm_targets = self._arm_center_joint_pos[:, self._arm_joint_ids] + self.cfg.arm_action_scale_rad * self.actions[:, :6]
-        arm_limits = self.arm.data.soft_joint_pos_limits[:, self._arm_joint_ids]
-        arm_targets = torch.clamp(arm_targets, arm_limits[..., 0], arm_limits[..., 1])
+        arm_targets = _clamped_targets(
+            self._arm_center_targets,
+            self.cfg.arm_action_scale_rad,
+            self.actions[:, :6],
+            self._arm_limits_lower,
+            self._arm_limits_upper,
+        )
         self.arm.set_joint_position_target(arm_targets, joint_ids=self._arm_joint_ids)
 
-        self.arm.write_data_to_sim()
-        self.scene.write_data_to_sim()
-        self.sim.forward()
-        self.scene.update(dt=0.0)
+        if self.cfg.sync_kinematics_before_hand_pose:
+            self.scene.write_data_to_sim()
+            self.sim.forward()
+            self.scene.update(dt=0.0)
 
         eef_pose = self.arm.data.body_link_pose_w[:, self._eef_body_id, :7]
-        hand_pos_w, hand_quat_w = combine_frame_transforms(
-            eef_pose[:, :3], eef_pose[:, 3:7], self._mount_pos_b, self._mount_quat_b
+        self.hand.write_root_pose_to_sim(
+            _hand_root_pose(eef_pose, self._mount_pos_b, self._mount_quat_b, self._hand_root_pose_buf)
         )
-        hand_root_pose = torch.cat((hand_pos_w, hand_quat_w), dim=-1)
-        self.hand.write_root_pose_to_sim(hand_root_pose)
         self.hand.write_root_velocity_to_sim(self._hand_root_velocity_zeros)
 
-        hand_targets = self._hand_joint_center[:, self._finger_joint_ids] + self.cfg.finger_action_scale_rad * self.actions[:, 6:9]
-        hand_limits = self.hand.data.soft_joint_pos_limits[:, self._finger_joint_ids]
-        hand_targets = torch.clamp(hand_targets, hand_limits[..., 0], hand_limits[..., 1])
+        hand_targets = _clamped_targets(
+            self._finger_center_targets,
+            self.cfg.finger_action_scale_rad,
+            self.actions[:, 6:9],
+            self._finger_limits_lower,
+            self._finger_limits_upper,
+        )
         self.hand.set_joint_position_target(hand_targets, joint_ids=self._finger_joint_ids)
 
-        tucked_targets = torch.zeros((self.num_envs, len(self._thumb_joint_ids) + len(self._pinky_joint_ids)), device=self.device)
-        self.hand.set_joint_position_target(tucked_targets[:, : len(self._thumb_joint_ids)], joint_ids=self._thumb_joint_ids)
-        self.hand.set_joint_position_target(tucked_targets[:, len(self._thumb_joint_ids) :], joint_ids=self._pinky_joint_ids)
+        self.hand.set_joint_position_target(self._thumb_tucked_targets, joint_ids=self._thumb_joint_ids)
+        self.hand.set_joint_position_target(self._pinky_tucked_targets, joint_ids=self._pinky_joint_ids)
 
     def _get_observations(self) -> dict:
-        arm_obs = self.arm.data.joint_pos[:, self._arm_joint_ids]
-        finger_obs = self.hand.data.joint_pos[:, self._finger_joint_ids]
+        arm_obs = self.arm.data.joint_pos.index_select(1, self._arm_joint_index)
+        finger_obs = self.hand.data.joint_pos.index_select(1, self._finger_joint_index)
         obs = torch.cat((arm_obs, finger_obs, self.current_midi_goal), dim=-1)
         return {"policy": obs}
 
     def _get_rewards(self) -> torch.Tensor:
-        tip_positions = self.hand.data.body_state_w[:, self._tip_body_ids, :3]
-        distances = torch.norm(tip_positions - self.current_target_pos.unsqueeze(1), dim=-1)
-        alignment_reward = 1.0 / (1.0 + torch.min(distances, dim=1).values)
-
-        discipline_ids = self._thumb_joint_ids + self._pinky_joint_ids
-        discipline_penalty = torch.norm(self.hand.data.joint_pos[:, discipline_ids], dim=1)
-
-        key_height = self.current_target_pos[:, 2].unsqueeze(1)
-        press_depth = key_height - tip_positions[:, :, 2]
-        force_reward = torch.where((press_depth > 0.0) & (press_depth < 0.010), 1.0, 0.0).sum(dim=1)
-
-        return 20.0 * alignment_reward - 15.0 * discipline_penalty + 5.0 * force_reward
+        return _step_reward(
+            self.hand.data.body_pos_w.index_select(1, self._tip_body_index),
+            self.current_target_pos,
+            self.hand.data.joint_pos.index_select(1, self._discipline_ids),
+        )
 
     def _get_dones(self) -> tuple[torch.Tensor, torch.Tensor]:
         time_out = self.episode_length_buf >= self.max_episode_length - 1
@@ -169,27 +235,26 @@ class PianistRLEnv(DirectRLEnv):
             self._arm_center_joint_pos[env_ids], self._arm_joint_vel_zeros[env_ids], env_ids=env_ids
         )
         self.arm.set_joint_position_target(self._arm_center_joint_pos[env_ids], env_ids=env_ids)
-        self.arm.write_data_to_sim()
+        self.hand.write_joint_state_to_sim(
+            self._hand_joint_center[env_ids], self._hand_joint_vel_zeros[env_ids], env_ids=env_ids
+        )
+        self.hand.set_joint_position_target(self._hand_joint_center[env_ids], env_ids=env_ids)
         self.scene.write_data_to_sim()
+        # One forward for the whole reset: only the hand root depends on the new link_eef pose,
+        # and nothing reads the hand's body poses again before the next physics step.
         self.sim.forward()
         self.scene.update(dt=0.0)
 
         eef_pose = self.arm.data.body_link_pose_w[env_ids, self._eef_body_id, :7]
-        hand_pos_w, hand_quat_w = combine_frame_transforms(
-            eef_pose[:, :3], eef_pose[:, 3:7], self._mount_pos_b[env_ids], self._mount_quat_b[env_ids]
+        hand_root_pose = _hand_root_pose(
+            eef_pose, self._mount_pos_b, self._mount_quat_b, self._hand_root_pose_buf.narrow(0, 0, eef_pose.shape[0])
         )
-        hand_root_pose = torch.cat((hand_pos_w, hand_quat_w), dim=-1)
         self.hand.write_root_pose_to_sim(hand_root_pose, env_ids=env_ids)
         self.hand.write_root_velocity_to_sim(self._hand_root_velocity_zeros[env_ids], env_ids=env_ids)
-        self.hand.write_joint_state_to_sim(
-            self._hand_joint_center[env_ids], self._hand_joint_vel_zeros[env_ids], env_ids=env_ids
-        )
-        self.hand.set_joint_position_target(self._hand_joint_center[env_ids], env_ids=env_ids)
-        self.scene.write_data_to_sim()
-        self.sim.forward()
-        self.scene.update(self.physics_dt)
 
     def _sample_targets(self, env_ids: torch.Tensor):
+        # Curriculum terms get the whole reset batch as a long index tensor and must update the
+        # goal buffers with batched tensor ops on the sim device (no per-env Python loops).
         curriculum_term = getattr(getattr(self.cfg, "curriculum", None), "note_selection", None)
         if curriculum_term is not None:
             curriculum_term.func(self, env_ids, **curriculum_term.params)
@@ -1,5 +1,6 @@
 import argparse
 import copy
+import os
 import sys
 
 if "--headless" not in sys.argv:
@@ -7,12 +8,26 @@ if "--headless" not in sys.argv:
 
 from isaaclab.app import AppLauncher
 
+from host_threads import pin_host_threads_env, pin_torch_threads
+
 parser = argparse.ArgumentParser(description="Train the 1-octave pianist policy with skrl PPO.")
 parser.add_argument("--timesteps", type=int, default=1_000_000)
 parser.add_argument("--num_envs", type=int, default=4096)
+parser.add_argument(
+    "--compile_models",
+    action="store_true",
+    help="Wrap the policy/value MLPs in torch.compile (needs a working Triton toolchain).",
+)
+parser.add_argument(
+    "--bf16_rollout",
+    action="store_true",
+    help="Run rollout-time policy/value inference under bfloat16 autocast (CUDA only).",
+)
 AppLauncher.add_app_launcher_args(parser)
 args_cli, _ = parser.parse_known_args()
 
+host_threads_pinned = pin_host_threads_env(args_cli.device)
+
 app_launcher = AppLauncher(args_cli)
 simulation_app = app_launcher.app
 
@@ -20,6 +35,9 @@ import gymnasium as gym
 import torch
 import torch.nn as nn
 
+if host_threads_pinned:
+    pin_torch_threads()
+
 from skrl import config as skrl_config
 from skrl.agents.torch.ppo import PPO, PPO_DEFAULT_CONFIG
 from skrl.memories.torch import RandomMemory
@@ -32,7 +50,18 @@ from isaaclab_rl.skrl import SkrlVecEnvWrapper
 from pianist_env_cfg import PianistEnvCfg
 
 
+def run_net(model: Model, states: torch.Tensor) -> torch.Tensor:
+    # skrl trainers act and bootstrap values under no_grad, so this only narrows rollout
+    # inference; the PPO update forward/backward (grad enabled) stays in fp32.
+    if model.bf16_rollout and not torch.is_grad_enabled():
+        with torch.autocast(device_type="cuda", dtype=torch.bfloat16):
+            return model.net(states).float()
+    return model.net(states)
+
+
 class Policy(GaussianMixin, Model):
+    bf16_rollout = False
+
     def __init__(self, observation_space, action_space, device):
         Model.__init__(self, observation_space, action_space, device)
         GaussianMixin.__init__(
@@ -53,10 +82,12 @@ class Policy(GaussianMixin, Model):
         self.log_std_parameter = nn.Parameter(torch.zeros(self.num_actions))
 
     def compute(self, inputs, role):
-        return self.net(inputs["states"]), self.log_std_parameter, {}
+        return run_net(self, inputs["states"]), self.log_std_parameter, {}
 
 
 class Value(DeterministicMixin, Model):
+    bf16_rollout = False
+
     def __init__(self, observation_space, action_space, device):
         Model.__init__(self, observation_space, action_space, device)
         DeterministicMixin.__init__(self, clip_actions=False)
@@ -69,7 +100,7 @@ class Value(DeterministicMixin, Model):
         )
 
     def compute(self, inputs, role):
-        return self.net(inputs["states"]), {}
+        return run_net(self, inputs["states"]), {}
 
 
 def resolve_training_device(requested_device: str) -> str:
@@ -97,6 +128,9 @@ def install_skrl_device_override(resolved_device: str) -> None:
 
 def main():
     rl_device = resolve_training_device(args_cli.device)
+    if host_threads_pinned and rl_device == "cpu":
+        # Training fell back to the CPU, so it needs the intra-op threadpool after all.
+        torch.set_num_threads(os.cpu_count() or 1)
     install_skrl_device_override(rl_device)
 
     env_cfg = PianistEnvCfg()
@@ -112,6 +146,16 @@ def main():
         "policy": Policy(env.observation_space, env.action_space, device),
         "value": Value(env.observation_space, env.action_space, device),
     }
+    if args_cli.compile_models:
+        # Default mode fuses the Linear+ELU stacks. "reduce-overhead" (CUDA graphs) is avoided:
+        # PPO keeps rollout outputs alive across calls and feeds both rollout- and
+        # mini-batch-sized inputs, which graph replay would overwrite / re-record.
+        # Module.compile() compiles in place, so checkpoint state_dict keys stay unchanged.
+        for model in models.values():
+            model.net.compile()
+    if args_cli.bf16_rollout and device.type == "cuda":
+        for model in models.values():
+            model.bf16_rollout = True
 
     cfg = copy.deepcopy(PPO_DEFAULT_CONFIG)
     cfg["rollouts"] = 16
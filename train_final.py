@@ -9,14 +9,27 @@ if "--headless" not in sys.argv:
 
 from isaaclab.app import AppLauncher
 
+from host_threads import pin_host_threads_env, pin_torch_threads
+
 parser = argparse.ArgumentParser(description="Final C-major curriculum PPO training for the pianist task.")
 parser.add_argument("--num_envs", type=int, default=4096)
 parser.add_argument("--max_iterations", type=int, default=2048)
 parser.add_argument("--save_interval_seconds", type=int, default=300)
-parser.add_argument("--chunk_iterations", type=int, default=64)
+parser.add_argument(
+    "--compile_models",
+    action="store_true",
+    help="Wrap the policy/value MLPs in torch.compile (needs a working Triton toolchain).",
+)
+parser.add_argument(
+    "--bf16_rollout",
+    action="store_true",
+    help="Run rollout-time policy/value inference under bfloat16 autocast (CUDA only).",
+)
 AppLauncher.add_app_launcher_args(parser)
 args_cli, _ = parser.parse_known_args()
 
+host_threads_pinned = pin_host_threads_env(args_cli.device)
+
 app_launcher = AppLauncher(args_cli)
 simulation_app = app_launcher.app
 
@@ -24,6 +37,9 @@ import gymnasium as gym
 import torch
 import torch.nn as nn
 
+if host_threads_pinned:
+    pin_torch_threads()
+
 from skrl import config as skrl_config
 from skrl.agents.torch.ppo import PPO, PPO_DEFAULT_CONFIG
 from skrl.memories.torch import RandomMemory
@@ -36,7 +52,18 @@ from isaaclab_rl.skrl import SkrlVecEnvWrapper
 from pianist_env_cfg import PianistEnvCfg
 
 
+def run_net(model: Model, states: torch.Tensor) -> torch.Tensor:
+    # skrl trainers act and bootstrap values under no_grad, so this only narrows rollout
+    # inference; the PPO update forward/backward (grad enabled) stays in fp32.
+    if model.bf16_rollout and not torch.is_grad_enabled():
+        with torch.autocast(device_type="cuda", dtype=torch.bfloat16):
+            return model.net(states).float()
+    return model.net(states)
+
+
 class Policy(GaussianMixin, Model):
+    bf16_rollout = False
+
     def __init__(self, observation_space, action_space, device):
         Model.__init__(self, observation_space, action_space, device)
         GaussianMixin.__init__(
@@ -57,10 +84,12 @@ class Policy(GaussianMixin, Model):
         self.log_std_parameter = nn.Parameter(torch.zeros(self.num_actions))
 
     def compute(self, inputs, role):
-        return self.net(inputs["states"]), self.log_std_parameter, {}
+        return run_net(self, inputs["states"]), self.log_std_parameter, {}
 
 
 class Value(DeterministicMixin, Model):
+    bf16_rollout = False
+
     def __init__(self, observation_space, action_space, device):
         Model.__init__(self, observation_space, action_space, device)
         DeterministicMixin.__init__(self, clip_actions=False)
@@ -73,7 +102,7 @@ class Value(DeterministicMixin, Model):
         )
 
     def compute(self, inputs, role):
-        return self.net(inputs["states"]), {}
+        return run_net(self, inputs["states"]), {}
 
 
 def install_skrl_device_override(resolved_device: str) -> None:
@@ -88,6 +117,34 @@ def install_skrl_device_override(resolved_device: str) -> None:
     skrl_config.torch.parse_device = staticmethod(_parse_device)
 
 
+class TimedCheckpointCallback:
+    def __init__(self, agent, run_dir: Path, interval_seconds: float):
+        self.agent = agent
+        self.run_dir = run_dir
+        self.interval_seconds = interval_seconds
+        self.last_save_time = time.time()
+
+    def on_iteration_end(self, timestep: int, timesteps: int) -> None:
+        completed_iterations = timestep + 1
+        now = time.time()
+        if now - self.last_save_time >= self.interval_seconds or completed_iterations >= timesteps:
+            checkpoint_path = self.run_dir / f"checkpoint_iter_{completed_iterations}.pt"
+            self.agent.save(str(checkpoint_path))
+            self.last_save_time = now
+            print(f"[INFO] Saved checkpoint: {checkpoint_path}")
+
+    def install(self) -> None:
+        # skrl trainers have no callback hooks; run after the agent's own post-interaction step
+        # (where PPO updates) so every checkpoint holds the freshly updated weights.
+        post_interaction = self.agent.post_interaction
+
+        def _post_interaction(timestep: int, timesteps: int) -> None:
+            post_interaction(timestep=timestep, timesteps=timesteps)
+            self.on_iteration_end(timestep, timesteps)
+
+        self.agent.post_interaction = _post_interaction
+
+
 def main():
     rl_device = args_cli.device
     install_skrl_device_override(rl_device)
@@ -105,6 +162,16 @@ def main():
         "policy": Policy(env.observation_space, env.action_space, device),
         "value": Value(env.observation_space, env.action_space, device),
     }
+    if args_cli.compile_models:
+        # Default mode fuses the Linear+ELU stacks. "reduce-overhead" (CUDA graphs) is avoided:
+        # PPO keeps rollout outputs alive across calls and feeds both rollout- and
+        # mini-batch-sized inputs, which graph replay would overwrite / re-record.
+        # Module.compile() compiles in place, so checkpoint state_dict keys stay unchanged.
+        for model in models.values():
+            model.net.compile()
+    if args_cli.bf16_rollout and device.type == "cuda":
+        for model in models.values():
+            model.bf16_rollout = True
 
     cfg = copy.deepcopy(PPO_DEFAULT_CONFIG)
     cfg["rollouts"] = 16
@@ -142,21 +209,11 @@ def main():
     run_dir = Path(cfg["experiment"]["directory"]) / cfg["experiment"]["experiment_name"]
     run_dir.mkdir(parents=True, exist_ok=True)
 
-    completed_iterations = 0
-    last_save_time = time.time()
-
-    while completed_iterations < args_cli.max_iterations:
-        chunk = min(args_cli.chunk_iterations, args_cli.max_iterations - completed_iterations)
-        trainer = SequentialTrainer(cfg={"timesteps": chunk, "headless": True}, env=env, agents=agent)
-        trainer.train()
-        completed_iterations += chunk
-
-        now = time.time()
-        if now - last_save_time >= args_cli.save_interval_seconds or completed_iterations >= args_cli.max_iterations:
-            checkpoint_path = run_dir / f"checkpoint_iter_{completed_iterations}.pt"
-            agent.save(str(checkpoint_path))
-            last_save_time = now
-            print(f"[INFO] Saved checkpoint: {checkpoint_path}")
+    # One trainer for the whole run: rebuilding it per chunk re-ran agent.init(), which
+    # re-created the rollout memory tensors every time.
+    TimedCheckpointCallback(agent, run_dir, args_cli.save_interval_seconds).install()
+    trainer = SequentialTrainer(cfg={"timesteps": args_cli.max_iterations, "headless": True}, env=env, agents=agent)
+    trainer.train()
 
     final_path = run_dir / "final_policy.pt"
     agent.save(str(final_path))